@@ -1,7 +1,20 @@
+import time
+_import_start = time.perf_counter()
+
 from flask import Flask
 from route.analyze_route import analyze_bp
 from route.video_route import video_bp
+from route.job_route import job_bp
+from route.health_route import health_bp
+from service.lstm_service import warm_up_lstm_models
+from service.movenet_service import warm_up_movenet
+from service.reference_store import reference_store, PITCH_TYPES
+from service.reference_index import reference_index
+from service.render_pool import render_pool
+from service.startup import startup
+import config
 import os
+import multiprocessing
 
 app = Flask(__name__)
 
@@ -12,6 +25,49 @@ os.makedirs("output/comparison", exist_ok=True)
 # 라우트 등록
 app.register_blueprint(analyze_bp)
 app.register_blueprint(video_bp)
+app.register_blueprint(job_bp)
+app.register_blueprint(health_bp)
+
+# import 시점에는 모델을 로드하지 않음 (렌더 worker 등이 이 모듈을 다시 import해도 가벼움)
+startup.record("import", time.perf_counter() - _import_start)
+
+
+# 기준 자세 미리 로드
+def load_references():
+    reference_store.load_all()
+    for pitch_type in PITCH_TYPES:
+        reference_index.get(pitch_type)
+
+
+# 비교 영상 렌더 풀 시작 (요청마다 Pool을 만들지 않도록)
+def start_render_pool():
+    if config.RENDER_PROCESSES > 0:
+        render_pool.start()
+
+
+# 서버 warm-up 단계 (순서대로 실행, /readyz에 단계별 소요 시간 표시)
+WARM_UP_STEPS = [
+    ("lstm", warm_up_lstm_models),
+    ("movenet", warm_up_movenet),
+    ("references", load_references),
+    ("render_pool", start_render_pool),
+]
+
+
+# warm-up 시작 (WARM_UP=off면 단계 없이 바로 ready)
+def start_warm_up():
+    # spawn으로 뜨는 렌더 worker가 이 모듈을 다시 import한 경우는 실행하지 않음
+    if multiprocessing.current_process().name != "MainProcess":
+        return
+    startup.start(WARM_UP_STEPS if config.WARM_UP != "off" else [], background=config.WARM_UP == "background")
+
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    debug = True
+    # debug reloader의 감시(부모) 프로세스는 요청을 처리하지 않으므로 warm-up은 서버 프로세스에서만
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_warm_up()
+    app.run(host='0.0.0.0', port=5000, debug=debug)
+else:
+    # flask run / gunicorn 등 WSGI 서버가 이 모듈을 import한 경우
+    start_warm_up()
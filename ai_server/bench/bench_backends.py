@@ -0,0 +1,127 @@
+# Keras/SavedModel vs TFLite(none/dynamic/int8) 백엔드 정확도 일치도, 지연 시간, 메모리 비교
+# 사용법: python bench/bench_backends.py [pitch_type] [video_path]
+#   - LSTM   : data/lstm_dataset/{pitch_type}의 원본 diff 시퀀스로 프레임별 확률/라벨 비교
+#   - MoveNet: video_path가 있으면 프레임별 keypoints 비교 + data/keypoints_norm 기준 DTW 거리 비교
+#   TFLite 모델은 먼저 train/export_tflite.py로 변환해 두어야 함
+import sys, os, time
+from glob import glob
+import numpy as np
+import cv2
+import tensorflow as tf
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.lstm_service import EXPECTED_LEN, load_lstm_predictor, lstm_model_path
+from service.tflite_backend import QUANTIZATIONS, TFLitePredictor, load_tflite_predictor, tflite_model_path
+from service.dtw_engine import dtw
+from service.movenet_service import normalize_keypoints_batch
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(BASE_PATH, "..", "data", "lstm_dataset")
+KEYPOINT_DIR = os.path.join(BASE_PATH, "..", "data", "keypoints_norm")
+MOVENET_PATH = os.path.join("model", "movenet_thunder")
+
+pitch_type = sys.argv[1] if len(sys.argv) > 1 else "stroker"
+video_path = sys.argv[2] if len(sys.argv) > 2 else None
+
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+# 로드 전후 RSS 차이로 백엔드별 메모리 측정
+def load_measured(loader, path):
+    before = rss_mb()
+    start = time.perf_counter()
+    predict = loader(path)
+    return predict, time.perf_counter() - start, rss_mb() - before
+
+
+def backends(name):
+    for quantization in QUANTIZATIONS:
+        path = tflite_model_path(name, quantization)
+        if os.path.exists(path):
+            yield f"tflite-{quantization}", path
+        else:
+            print(f"[{quantization}] 스킵 (파일 없음): {path}")
+
+
+# ---- LSTM ----
+maxlen = EXPECTED_LEN[pitch_type]
+files = sorted(f for f in glob(os.path.join(DATASET_DIR, pitch_type, "*_diff.npy"))
+               if not any(tag in f for tag in ("_jitter", "_stretch", "_compress")))
+inputs = pad_sequences([np.load(f) for f in files], padding="post", maxlen=maxlen,
+                       dtype="float32", truncating="post")
+print(f"[LSTM {pitch_type}] {len(inputs)}개 시퀀스 | 길이 {maxlen}")
+
+
+def run_lstm(predict):
+    predict(inputs[:1])  # warm-up
+    start = time.perf_counter()
+    preds = np.concatenate([np.asarray(predict(x[None])) for x in inputs])[..., 0]
+    return preds, (time.perf_counter() - start) / len(inputs) * 1000
+
+
+keras_predict, load_time, mem = load_measured(load_lstm_predictor, lstm_model_path(pitch_type))
+reference, latency = run_lstm(keras_predict)
+print(f"[keras]          지연 {latency:6.2f}ms/seq | 로드 {load_time:.2f}s | RSS +{mem:.1f}MB")
+
+for label, path in backends(f"lstm_{pitch_type}"):
+    predict, load_time, mem = load_measured(load_tflite_predictor, path)
+    preds, latency = run_lstm(predict)
+    max_err = np.abs(preds - reference).max()
+    agreement = ((preds > 0.5) == (reference > 0.5)).mean() * 100
+    print(f"[{label:15s}] 지연 {latency:6.2f}ms/seq | 로드 {load_time:.2f}s | RSS +{mem:.1f}MB | "
+          f"확률 최대 오차 {max_err:.2e} | 라벨 일치 {agreement:.2f}% | "
+          f"크기 {os.path.getsize(path) / 1024:.0f}KB")
+
+
+# ---- MoveNet ----
+if video_path is None:
+    print("[MoveNet] 스킵 (video_path 필요)")
+    sys.exit()
+
+
+def load_savedmodel(path):
+    movenet_fn = tf.saved_model.load(path).signatures["serving_default"]
+    return lambda x: np.concatenate([movenet_fn(tf.constant(f[None]))["output_0"].numpy() for f in x])
+
+
+cap = cv2.VideoCapture(video_path)
+frames = []
+while True:
+    ret, frame = cap.read()
+    if not ret:
+        break
+    frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+cap.release()
+images = tf.cast(tf.image.resize_with_pad(np.stack(frames), 256, 256), tf.int32).numpy()
+references = [np.load(f)[:, :, :2].reshape(-1, 34) for f in sorted(glob(os.path.join(KEYPOINT_DIR, pitch_type, "*.npy")))]
+print(f"[MoveNet] {len(images)}프레임 | 기준 시퀀스 {len(references)}개")
+
+
+def run_movenet(predict):
+    predict(images[:1])  # warm-up
+    start = time.perf_counter()
+    keypoints = predict(images)[:, 0]
+    fps = len(images) / (time.perf_counter() - start)
+    # 서비스와 같은 정규화 → (T, 34) flatten
+    test_seq = normalize_keypoints_batch(keypoints)[:, :, :2].reshape(-1, 34)
+    distances = np.array([dtw(ref, test_seq)[0] for ref in references])
+    return keypoints, fps, distances
+
+
+movenet_predict, load_time, mem = load_measured(load_savedmodel, MOVENET_PATH)
+ref_keypoints, fps, ref_distances = run_movenet(movenet_predict)
+print(f"[savedmodel]     {fps:6.1f} fps | 로드 {load_time:.2f}s | RSS +{mem:.1f}MB")
+
+for label, path in backends("movenet_thunder"):
+    predict, load_time, mem = load_measured(lambda p: TFLitePredictor(p), path)
+    keypoints, fps, distances = run_movenet(predict)
+    xy_err = np.abs(keypoints[..., :2] - ref_keypoints[..., :2])
+    dtw_drift = np.abs(distances - ref_distances) / np.maximum(ref_distances, 1e-6) * 100
+    print(f"[{label:15s}] {fps:6.1f} fps | 로드 {load_time:.2f}s | RSS +{mem:.1f}MB | "
+          f"좌표 오차 평균 {xy_err.mean():.2e} 최대 {xy_err.max():.2e} | DTW 거리 변화 평균 {dtw_drift.mean():.2f}%")
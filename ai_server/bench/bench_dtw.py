@@ -0,0 +1,37 @@
+# fastdtw vs dtw_engine 속도 및 거리 일치도 비교
+# 사용법: python bench/bench_dtw.py [pitch_type] [window]
+import sys, os, time
+from glob import glob
+import numpy as np
+from fastdtw import fastdtw
+from scipy.spatial.distance import euclidean
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.dtw_engine import dtw
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+KEYPOINT_DIR = os.path.join(BASE_PATH, "..", "data", "keypoints_norm")
+
+pitch_type = sys.argv[1] if len(sys.argv) > 1 else "stroker"
+window = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+files = sorted(glob(os.path.join(KEYPOINT_DIR, pitch_type, "*.npy")))
+seqs = [np.load(f)[:, :, :2].reshape(-1, 34) for f in files]
+ref = seqs[0]
+print(f"[{pitch_type}] 기준 {os.path.basename(files[0])} vs {len(seqs) - 1}개 | window={window}")
+
+fast_time, engine_time, ratios = 0.0, 0.0, []
+for test in seqs[1:]:
+    start = time.perf_counter()
+    fast_dist, _ = fastdtw(list(ref), list(test), dist=euclidean)
+    fast_time += time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine_dist, _ = dtw(ref, test, window=window)
+    engine_time += time.perf_counter() - start
+
+    ratios.append(engine_dist / fast_dist)
+
+ratios = np.array(ratios)
+print(f"fastdtw   : {fast_time:.3f}s")
+print(f"dtw_engine: {engine_time:.3f}s (x{fast_time / engine_time:.1f})")
+print(f"거리 비율(engine/fastdtw): 평균={ratios.mean():.4f} 최소={ratios.min():.4f} 최대={ratios.max():.4f}")
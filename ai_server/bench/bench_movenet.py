@@ -0,0 +1,45 @@
+# 프레임 단위 추론 vs 배치 추론 처리량(frames/sec) 비교
+# 사용법: python bench/bench_movenet.py [video_path] [batch_size ...]
+import sys, os, time
+import numpy as np
+import cv2
+import tensorflow as tf
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.movenet_service import (
+    detect_pose, detect_pose_batch, read_frame_batches, get_movenet
+)
+
+if len(sys.argv) < 2:
+    print("사용법: python bench/bench_movenet.py [video_path] [batch_size ...]")
+    sys.exit()
+
+video_path = sys.argv[1]
+batch_sizes = [int(b) for b in sys.argv[2:]] or [16, 32, 64]
+
+
+# 디코딩 비용을 제외하기 위해 프레임을 미리 읽어 둠
+cap = cv2.VideoCapture(video_path)
+frames = [f for batch in read_frame_batches(cap, 64) for f in batch]
+cap.release()
+print(f"총 {len(frames)}프레임 | 배치 signature 지원={get_movenet().supports_batch}")
+
+
+# 기존 방식: 프레임마다 detect_pose 호출
+detect_pose(tf.convert_to_tensor(frames[0]))  # warm-up
+start = time.perf_counter()
+per_frame = np.array([detect_pose(tf.convert_to_tensor(f)) for f in frames])
+elapsed = time.perf_counter() - start
+print(f"[per-frame] {len(frames) / elapsed:.1f} fps ({elapsed:.2f}s)")
+
+
+# 배치 방식
+for batch_size in batch_sizes:
+    detect_pose_batch(frames[:batch_size])  # warm-up (그래프 trace)
+    start = time.perf_counter()
+    batched = np.concatenate([
+        detect_pose_batch(frames[i:i + batch_size])
+        for i in range(0, len(frames), batch_size)
+    ])
+    elapsed = time.perf_counter() - start
+    max_err = np.abs(batched - per_frame).max()
+    print(f"[batch={batch_size}] {len(frames) / elapsed:.1f} fps ({elapsed:.2f}s) | 최대 오차={max_err:.2e}")
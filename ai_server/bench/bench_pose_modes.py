@@ -0,0 +1,51 @@
+# 포즈 추정 모드(thunder / lightning / adaptive)별 처리량과 점수 변화(thunder 대비) 비교
+# 사용법: python bench/bench_pose_modes.py [video_path] [pitch_type]
+import sys, os, time
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.movenet_service import extract_keypoints_from_video, warm_up_movenet, POSE_MODES
+from service.dtw_service import compare_with_nearest_references, compute_diff_sequence
+from service.lstm_service import predict_framewise_labels, lstm_model_path
+import config
+
+if len(sys.argv) < 2:
+    print("사용법: python bench/bench_pose_modes.py [video_path] [pitch_type]")
+    sys.exit()
+
+video_path = sys.argv[1]
+pitch_type = sys.argv[2] if len(sys.argv) > 2 else "stroker"
+
+results = {}
+for mode in POSE_MODES:
+    config.POSE_MODE = mode
+    warm_up_movenet()  # 모델 로드 시간 제외
+
+    start = time.perf_counter()
+    raw, norm = extract_keypoints_from_video(video_path, None, mode=mode)
+    elapsed = time.perf_counter() - start
+    if norm is None:
+        print(f"[{mode}] 키포인트 추출 실패")
+        continue
+
+    dtw_score, _, ref, test, path, _ = compare_with_nearest_references(pitch_type, norm)
+    labels, confidence = predict_framewise_labels(compute_diff_sequence(ref, test, path), lstm_model_path(pitch_type))
+    results[mode] = {
+        "fps": len(norm) / elapsed,
+        "dtw": dtw_score,
+        "lstm": confidence * 100,
+        "labels": np.array(labels),
+        "norm": norm,
+    }
+
+print(f"\n[{pitch_type}] {os.path.basename(video_path)}")
+base = results.get("thunder")
+for mode, r in results.items():
+    line = f"[{mode:9s}] {r['fps']:6.1f} fps | DTW score {r['dtw']:6.2f} | LSTM score {r['lstm']:6.2f}"
+    if base is not None and mode != "thunder":
+        n = min(len(base["labels"]), len(r["labels"]))
+        agreement = (base["labels"][:n] == r["labels"][:n]).mean() * 100
+        kp_err = np.abs(base["norm"][:, :, :2] - r["norm"][:, :, :2]).mean()
+        line += (f" | 처리량 x{r['fps'] / base['fps']:.2f} | DTW 변화 {r['dtw'] - base['dtw']:+.2f}"
+                 f" | LSTM 변화 {r['lstm'] - base['lstm']:+.2f} | 라벨 일치 {agreement:.1f}%"
+                 f" | 정규화 좌표 평균 오차 {kp_err:.4f}")
+    print(line)
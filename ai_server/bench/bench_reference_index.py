@@ -0,0 +1,49 @@
+# 기준 라이브러리 크기별 최근접 검색 지연 시간 측정
+# 기존 시퀀스를 노이즈/시간 늘림으로 복제해 N개 라이브러리를 만들어 측정
+# 사용법: python bench/bench_reference_index.py [pitch_type] [N ...]
+import sys, os, time
+from glob import glob
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.reference_store import ReferenceEntry
+from service.reference_index import PitchIndex, resample_sequence
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+KEYPOINT_DIR = os.path.join(BASE_PATH, "..", "data", "keypoints_norm")
+
+pitch_type = sys.argv[1] if len(sys.argv) > 1 else "stroker"
+sizes = [int(n) for n in sys.argv[2:]] or [100, 1000, 5000]
+
+files = sorted(glob(os.path.join(KEYPOINT_DIR, pitch_type, "*.npy")))
+base = [np.load(f).astype(np.float32) for f in files]
+rng = np.random.default_rng(0)
+
+
+def synthesize(n):
+    entries = []
+    for i in range(n):
+        kp = base[i % len(base)]
+        length = int(len(kp) * rng.uniform(0.8, 1.2))
+        flat = resample_sequence(kp.reshape(len(kp), -1), length)
+        kp = flat.reshape(length, 17, 3) + rng.normal(0, 0.02, (length, 17, 3)).astype(np.float32)
+        entries.append(ReferenceEntry(f"synthetic_{i:05d}.npy", 0.0, kp))
+    return entries
+
+
+query = base[len(base) // 2]
+query_flat = query[:, :, :2].reshape(len(query), -1)
+
+for n in sizes:
+    entries = synthesize(n)
+    start = time.perf_counter()
+    index = PitchIndex(entries)
+    build = time.perf_counter() - start
+
+    index.query(query_flat, k=3)
+    start = time.perf_counter()
+    repeats = 5
+    for _ in range(repeats):
+        matches = index.query(query_flat, k=3)
+    elapsed = (time.perf_counter() - start) / repeats
+    best = ", ".join(f"{m['entry'].name}={m['distance']:.1f}" for m in matches)
+    print(f"N={n:5d} | 인덱스 생성 {build:.2f}s | 검색 {elapsed * 1000:.1f}ms | {best}")
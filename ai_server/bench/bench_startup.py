@@ -0,0 +1,40 @@
+# 모듈별 import 시간 (새 프로세스에서 측정) + 선택 시 서버 warm-up 단계별 시간
+# 사용법: python bench/bench_startup.py [--warm-up]
+import sys, os, time, subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 가벼워야 하는 프로세스: 렌더 worker, 비디오/헬스 라우트, 서버 모듈 import
+MODULES = [
+    "service.render_worker",
+    "route.video_route",
+    "service.movenet_service",
+    "service.lstm_service",
+    "app",
+    "tensorflow",  # 비교용: TensorFlow import 비용
+]
+
+CODE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(f"{{time.perf_counter() - start:.3f}} {{'tensorflow' in sys.modules}}")
+"""
+
+for module in MODULES:
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", CODE.format(module=module)],
+        cwd=ROOT, capture_output=True, text=True
+    ).stdout.strip().splitlines()
+    total = time.perf_counter() - start
+    import_time, tf_loaded = out[-1].split() if out else ("?", "?")
+    print(f"{module:28s} import {import_time}s | 프로세스 전체 {total:.3f}s | TensorFlow 로드={tf_loaded}")
+
+if "--warm-up" in sys.argv:
+    sys.path.append(ROOT)
+    os.chdir(ROOT)
+    import app
+    app.startup.run(app.WARM_UP_STEPS)
+    print(app.startup.status())
+    app.render_pool.close()
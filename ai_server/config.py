@@ -0,0 +1,84 @@
+# config.py
+# 서버 전역 설정 (환경변수로 덮어쓰기 가능)
+import os
+
+# MoveNet 배치 추론 크기 (16~64 권장)
+POSE_BATCH_SIZE = int(os.environ.get("POSE_BATCH_SIZE", 32))
+
+# 디코딩/추론/후처리 단계 사이 queue 크기 (배치 단위)
+POSE_QUEUE_SIZE = int(os.environ.get("POSE_QUEUE_SIZE", 4))
+
+# DTW Sakoe-Chiba band 반경(프레임), 빈 값이면 전체 탐색
+DTW_WINDOW = int(os.environ["DTW_WINDOW"]) if os.environ.get("DTW_WINDOW") else None
+
+# 다중 기준 자세 비교: 최근접 기준 개수 / 임베딩 단계 후보 수
+REFERENCE_TOP_K = int(os.environ.get("REFERENCE_TOP_K", 3))
+REFERENCE_SHORTLIST = int(os.environ.get("REFERENCE_SHORTLIST", 32))
+# 기준 폴더 mtime이 그대로면 이 시간(초) 동안 기준 파일별 mtime 재확인 생략 (파일 내용만 덮어쓴 경우 대비)
+REFERENCE_RESCAN_SECONDS = float(os.environ.get("REFERENCE_RESCAN_SECONDS", 30))
+
+# 비동기 분석 작업 큐: 동시 실행 수 / 최대 대기 수(초과 시 429) / 완료 결과 보관 시간(초)
+ANALYZE_WORKERS = int(os.environ.get("ANALYZE_WORKERS", 2))
+ANALYZE_MAX_PENDING = int(os.environ.get("ANALYZE_MAX_PENDING", 16))
+JOB_RESULT_TTL = int(os.environ.get("JOB_RESULT_TTL", 3600))
+
+# 비교 영상 렌더링 작업 큐: 동시 렌더 수 / 최대 대기 수(초과 시 요청 스레드에서 렌더)
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", 1))
+RENDER_MAX_PENDING = int(os.environ.get("RENDER_MAX_PENDING", 32))
+
+# 비교 영상 렌더링: 프로세스 수(0이면 현재 프로세스에서 렌더) / 한 번에 렌더링할 프레임 수
+RENDER_PROCESSES = int(os.environ.get("RENDER_PROCESSES", 4))
+RENDER_CHUNK_SIZE = int(os.environ.get("RENDER_CHUNK_SIZE", 32))
+
+# 비교 영상 인코딩 (ffmpeg libx264): preset / CRF / 스레드 수(0=자동)
+FFMPEG_PRESET = os.environ.get("FFMPEG_PRESET", "veryfast")
+FFMPEG_CRF = int(os.environ.get("FFMPEG_CRF", 23))
+FFMPEG_THREADS = int(os.environ.get("FFMPEG_THREADS", 0))
+# 미리보기(fast) 모드 인코딩: preset / 해상도 배율
+PREVIEW_PRESET = os.environ.get("PREVIEW_PRESET", "ultrafast")
+PREVIEW_SCALE = float(os.environ.get("PREVIEW_SCALE", 0.5))
+
+# 분석 결과 캐시 (영상 해시 기반): 저장 경로 / 최대 용량(바이트, 초과 시 LRU 삭제)
+CACHE_DIR = os.environ.get("CACHE_DIR", os.path.join("output", "cache"))
+CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", 2 * 1024 ** 3))
+
+# LSTM micro-batching: 같은 구질 동시 요청을 최대 N개 / 최대 대기 시간(ms)까지 모아 한 번에 추론
+LSTM_BATCH_SIZE = int(os.environ.get("LSTM_BATCH_SIZE", 8))
+LSTM_BATCH_WAIT_MS = float(os.environ.get("LSTM_BATCH_WAIT_MS", 5))
+# MoveNet: 동시 업로드의 프레임 배치를 최대 N개까지 합쳐 추론 (1이면 합치지 않음)
+POSE_MERGE_BATCHES = int(os.environ.get("POSE_MERGE_BATCHES", 4))
+POSE_MERGE_WAIT_MS = float(os.environ.get("POSE_MERGE_WAIT_MS", 2))
+
+# 추론 백엔드: "keras"(.h5 / SavedModel) 또는 "tflite"(train/export_tflite.py로 변환한 모델)
+INFERENCE_BACKEND = os.environ.get("INFERENCE_BACKEND", "keras")
+# TFLite 모델 경로 / 양자화 종류("none", "dynamic", "int8") / Interpreter 스레드 수(0=자동)
+TFLITE_DIR = os.environ.get("TFLITE_DIR", os.path.join("model", "tflite"))
+TFLITE_QUANTIZATION = os.environ.get("TFLITE_QUANTIZATION", "dynamic")
+TFLITE_THREADS = int(os.environ.get("TFLITE_THREADS", 0))
+
+# 서버 시작 시 모델 warm-up: "background"(요청을 받으면서 로드) / "sync"(로드 후 서버 시작) / "off"(첫 요청 때 로드)
+WARM_UP = os.environ.get("WARM_UP", "background")
+
+# 포즈 추정 모드 기본값: "thunder"(256×256) / "lightning"(192×192, 빠름) / "adaptive"(전체 Lightning + 스윙/릴리스 구간만 Thunder)
+POSE_MODE = os.environ.get("POSE_MODE", "thunder")
+# adaptive: 손목 속도가 최대값의 이 비율 이상인 구간 + 앞뒤 여유 프레임을 Thunder로 다시 추론
+ADAPTIVE_SPEED_RATIO = float(os.environ.get("ADAPTIVE_SPEED_RATIO", 0.25))
+ADAPTIVE_MARGIN = int(os.environ.get("ADAPTIVE_MARGIN", 15))
+
+# 프레임 샘플링: 이 fps에 가깝게 N프레임마다 추론하고 나머지는 보간 (0이면 모든 프레임 추론)
+POSE_TARGET_FPS = float(os.environ.get("POSE_TARGET_FPS", 0))
+# 보간 시 좌표 기준점으로 쓰는 최소 관절 confidence
+POSE_MIN_CONFIDENCE = float(os.environ.get("POSE_MIN_CONFIDENCE", 0.2))
+# LSTM 입력(DTW 정렬된 diff 시퀀스)을 구질별 EXPECTED_LEN으로 리샘플 (잘라내기/패딩 대신)
+LSTM_RESAMPLE_TO_EXPECTED_LEN = os.environ.get("LSTM_RESAMPLE_TO_EXPECTED_LEN", "0").lower() in ("1", "true", "yes")
+
+# ROI tracking: 이전 배치 keypoints로 선수 주변만 잘라 추론 (몸통을 놓친 프레임은 전체 프레임으로 재추론)
+POSE_ROI = os.environ.get("POSE_ROI", "0").lower() in ("1", "true", "yes")
+# crop 기준으로 쓰는 관절 최소 confidence / crop 크기 배율(배치 내 움직임 여유)
+ROI_MIN_SCORE = float(os.environ.get("ROI_MIN_SCORE", 0.2))
+ROI_SCALE = float(os.environ.get("ROI_SCALE", 1.2))
+# crop 하나를 공유하는 최대 프레임 수 (이 단위마다 직전 프레임 keypoints로 crop 갱신)
+ROI_SUB_BATCH = int(os.environ.get("ROI_SUB_BATCH", 4))
+
+# 학습 데이터셋 keypoints 추출 프로세스 수 (프로세스마다 MoveNet 1개 로드)
+DATASET_WORKERS = int(os.environ.get("DATASET_WORKERS", 2))
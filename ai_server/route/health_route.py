@@ -0,0 +1,17 @@
+from flask import Blueprint, jsonify
+from service.startup import startup
+
+health_bp = Blueprint('health', __name__)
+
+
+#프로세스 생존 확인 (모델 로드 여부와 무관)
+@health_bp.route('/healthz')
+def healthz():
+    return jsonify({'status': 'ok'})
+
+
+#요청 처리 준비 확인 (warm-up 완료 전/실패 시 503)
+@health_bp.route('/readyz')
+def readyz():
+    status = startup.status()
+    return jsonify(status), (200 if status["ready"] else 503)
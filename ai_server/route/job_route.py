@@ -0,0 +1,70 @@
+from flask import Blueprint, jsonify, url_for
+from route.analyze_route import parse_analyze_request
+from service.analysis_service import save_upload, run_analysis, analysis_jobs
+from service.job_service import QueueFullError
+from service.render_service import render_jobs
+from service.render_pool import render_pool
+
+job_bp = Blueprint('job', __name__)
+
+
+#비동기 분석 요청: 업로드만 저장하고 job_id 즉시 반환
+@job_bp.route('/jobs/analyze_pose', methods=['POST'])
+def submit_analyze_job():
+    try:
+        params, error = parse_analyze_request()
+        if error:
+            return error
+
+        video_path, video_hash = save_upload(params["file"], params["uid"])
+        job_id = analysis_jobs.submit(
+            run_analysis, video_path, params["uid"], params["pitch_type"],
+            start_frame=params["start_frame"], end_frame=params["end_frame"],
+            preview=params["preview"], video_hash=video_hash, pose_mode=params["pose_mode"],
+            include_joint_series=params["joint_series"]
+        )
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": url_for('job.job_status', job_id=job_id),
+            "result_url": url_for('job.job_result', job_id=job_id)
+        }), 202
+
+    except QueueFullError as e:
+        return jsonify({'error': str(e), **analysis_jobs.stats()}), 429
+    except Exception as e:
+        print(f"작업 등록 중 오류: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+#작업 상태 (단계별 진행 상황)
+@job_bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업이 존재하지 않습니다.'}), 404
+    job.pop("result")
+    return jsonify(job)
+
+
+#작업 결과 (완료 전이면 202)
+@job_bp.route('/jobs/<job_id>/result')
+def job_result(job_id):
+    job = analysis_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업이 존재하지 않습니다.'}), 404
+    if job["status"] == "failed":
+        return jsonify({'error': job["error"]}), 500
+    if job["status"] != "done":
+        return jsonify({'job_id': job_id, 'status': job["status"], 'stage': job["stage"]}), 202
+    return jsonify(job["result"])
+
+
+#작업 큐 상태 (동시 실행/대기 수, 렌더 풀 사용률)
+@job_bp.route('/jobs')
+def job_queue_stats():
+    return jsonify({
+        "analyze": analysis_jobs.stats(),
+        "render": render_jobs.stats(),
+        "render_pool": render_pool.metrics()
+    })
@@ -1,11 +1,27 @@
 from flask import Blueprint, send_file, jsonify
+from service.render_service import render_path, render_status
 import os
 
 video_bp = Blueprint('video', __name__)
 
 @video_bp.route('/video/<filename>')
 def serve_video(filename):
-    path = os.path.join('output/comparison', filename)
-    if not os.path.exists(path):
+    status = render_status(filename)
+    if status == 'pending':
+        return jsonify({'status': 'pending', 'message': '비교 영상을 생성 중입니다.'}), 202
+
+    path = render_path(filename)
+    if path is None or not os.path.exists(path):
         return jsonify({'error': '비교 영상이 존재하지 않습니다.'}), 404
-    return send_file(path, mimetype='video/mp4', as_attachment=False)
\ No newline at end of file
+    return send_file(path, mimetype='video/mp4', as_attachment=False)
+
+#비교 영상 생성 상태 (pending/ready/failed)
+@video_bp.route('/video/status/<filename>')
+def video_status(filename):
+    status = render_status(filename)
+    if status is None:
+        if render_path(filename) is not None:
+            status = 'ready'
+        else:
+            return jsonify({'error': '비교 영상이 존재하지 않습니다.'}), 404
+    return jsonify({'filename': filename, 'status': status})
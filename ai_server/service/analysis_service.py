@@ -0,0 +1,250 @@
+# analysis_service.py
+# /analyze_pose 분석 파이프라인 (동기 라우트와 비동기 작업 큐에서 공통 사용)
+import cv2
+import os, uuid, shutil
+import config
+from service.movenet_service import extract_keypoints_from_video, pose_model_version
+from service.dtw_service import compare_with_nearest_references, compute_diff_sequence
+from service.lstm_service import predict_framewise_labels, lstm_model_version
+from service.reference_index import reference_index
+from service.result_cache import result_cache, save_stream_with_hash, make_key
+from service.visualize_service import JOINT_FEEDBACK_MAP
+from service.joint_analytics import analyze_joints, joint_series
+from service.render_service import schedule_render, render_status
+from service.job_service import JobQueue
+
+#구질 설정
+TYPE_MAP = {
+    '스트로커': 'stroker',
+    '투핸드': 'twohand',
+    '덤리스': 'thumbless',
+    '크랭커': 'cranker'
+}
+
+
+def map_pitch_type(pitch_type):
+    return TYPE_MAP.get(pitch_type.strip(), pitch_type.strip())
+
+
+#업로드 파일 저장 (저장하면서 sha256 계산)
+def save_upload(file, uid):
+    upload_dir = f"output/upload/{uid}"
+    os.makedirs(upload_dir, exist_ok=True)
+    # 원본 파일명 대신 내용 해시로 저장 (확장자만 유지)
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    video_path, video_hash = save_stream_with_hash(file.stream, upload_dir, ext)
+    print(f"영상 저장 완료: {video_path} (sha256={video_hash[:12]})")
+    return video_path, video_hash
+
+
+#캐시된 결과의 비교 영상 상태 (영상이 없으면 None → 다시 분석)
+def _cached_video_status(result):
+    path = result.get("comparison_video_path", "")
+    status = render_status(os.path.basename(path))
+    if status is None and os.path.exists(path):
+        status = "ready"
+    return status if status in ("pending", "ready") else None
+
+
+#캐시된 비교 영상을 요청한 uid 폴더에 연결 (다른 업로드의 uid 경로를 응답에 노출하지 않음)
+# 하드링크가 안 되는 파일 시스템이면 복사
+def _link_cached_video(result, uid):
+    source = result["comparison_video_path"]
+    comparison_dir = f"output/comparison/{uid}"
+    os.makedirs(comparison_dir, exist_ok=True)
+    comparison_name = f"comparison_{uuid.uuid4().hex}.mp4"
+    target = os.path.join(comparison_dir, comparison_name)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+    result.update(comparison_video_path=target, comparison_video_status_url=f"/video/status/{comparison_name}")
+
+
+#점수 기반 총평 + 관절별 피드백 문장 구성
+def build_feedback_text(lstm_score, dtw_score, labels, top_joints):
+    #이상 프레임 비율 계산
+    wrong_ratio = sum(labels) / len(labels) if len(labels) > 0 else 0
+
+    #관절별 피드백 문장 구성
+    feedback_lines = [JOINT_FEEDBACK_MAP[j] for j in top_joints if j in JOINT_FEEDBACK_MAP]
+
+    # 점수 기반 총평 메시지 (조건 세분화)
+    if lstm_score >= 90 and dtw_score >= 80 and wrong_ratio < 0.1:
+        summary = "폼이 안정적이며 일관성이 높습니다."
+    elif lstm_score >= 75:
+        summary = "대체로 양호하나 일부 자세에서 불균형이 감지됩니다."
+    else:
+        summary = "자세 흔들림이 많고 교정이 필요합니다."
+
+    #점수 기반 총평 메시지
+    feedback_text = (
+        f"**분석 요약**\n"
+        f"LSTM 안정도: {lstm_score:.2f}점\n"
+        f"DTW 유사도: {dtw_score:.2f}점\n\n"
+        f"**총평:** {summary}\n\n"
+    )
+
+    if feedback_lines:
+        feedback_text += "**개선이 필요한 부위:**\n- " + "\n- ".join(feedback_lines)
+    else:
+        feedback_text += "모든 관절이 안정적으로 유지되었습니다."
+    return feedback_text
+
+
+def run_analysis(video_path, uid, pitch_type, start_frame=0, end_frame=-1, preview=False, video_hash=None,
+                 progress=None, pose_mode=None, include_joint_series=False):
+    """
+    저장된 업로드 영상을 분석하고 JSON 응답용 dict를 반환합니다.
+    preview: 비교 영상을 빠른 미리보기 설정으로 인코딩
+    pose_mode: "thunder" / "lightning" / "adaptive" (기본 config.POSE_MODE)
+    video_hash: 업로드 sha256 (있으면 키포인트/결과 캐시 사용)
+    progress(stage): 단계가 바뀔 때마다 호출되는 콜백 (작업 큐 진행 상황 보고용)
+    include_joint_series: 관절별 프레임 오차 시계열(17×T)을 응답에 포함 (크기가 커서 요청 시에만, 결과 캐시와 별도 저장)
+    """
+    def report(stage):
+        if progress is not None:
+            progress(stage)
+
+    pose_mode = pose_mode or config.POSE_MODE
+
+    #1. 분석 구간 확인 (재인코딩 없이 원본에서 해당 구간만 처리)
+    report("range")
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    if end_frame == -1 or end_frame >= total_frames:
+        end_frame = total_frames - 1
+    print(f"[RANGE] {video_path} ({start_frame}~{end_frame})")
+
+    mapped_type = map_pitch_type(pitch_type)
+    model_path = f"model/lstm_{mapped_type}.h5"
+
+    # 같은 영상 + 구질 + 구간 + 모델 버전이면 저장된 결과를 그대로 사용
+    result_key = None
+    if video_hash:
+        result_key = make_key(
+            "result", video_hash, mapped_type, start_frame, end_frame, preview,
+            pose_model_version(pose_mode), lstm_model_version(model_path), reference_index.version(mapped_type),
+            config.REFERENCE_TOP_K, config.DTW_WINDOW, config.LSTM_RESAMPLE_TO_EXPECTED_LEN
+        )
+        cached = result_cache.get_result(result_key)
+        series = result_cache.get_result(make_key("joint_series", result_key)) if include_joint_series else None
+        # 시계열을 요청했는데 저장된 것이 없으면 다시 분석 (키포인트는 캐시 사용)
+        if cached is not None and (series is not None or not include_joint_series):
+            video_status = _cached_video_status(cached)
+            same_uid = cached.get("uid") == uid
+            # 다른 uid의 결과는 완성된 영상만 연결해 재사용 (렌더 중이면 다시 분석, 키포인트는 캐시 사용)
+            if video_status == "ready" or (video_status == "pending" and same_uid):
+                print(f"[CACHE] 분석 결과 캐시 사용: {video_hash[:12]} {mapped_type} ({start_frame}~{end_frame})")
+                if not same_uid:
+                    _link_cached_video(cached, uid)
+                cached.update(uid=uid, pitch_type=pitch_type, comparison_video_status=video_status, cached=True)
+                if series is not None:
+                    cached["joint_series"] = series
+                return cached
+
+    #2. MoveNet 키포인트 추출 (같은 영상/구간이면 캐시 사용 → 구질만 바꾸면 DTW+LSTM만 재실행)
+    report("keypoints")
+    keypoint_key = make_key("keypoints", video_hash, start_frame, end_frame, pose_model_version(pose_mode)) if video_hash else None
+    cached_keypoints = result_cache.get_keypoints(keypoint_key) if keypoint_key else None
+    if cached_keypoints is not None:
+        raw_keypoints, norm_keypoints = cached_keypoints
+        print(f"[CACHE] 키포인트 캐시 사용: {video_hash[:12]} ({len(norm_keypoints)}프레임)")
+    else:
+        keypoint_dir = f"output/keypoints/{uid}"
+        os.makedirs(keypoint_dir, exist_ok=True)
+        raw_keypoints, norm_keypoints = extract_keypoints_from_video(
+            video_path, keypoint_dir, start_frame=start_frame, end_frame=end_frame, mode=pose_mode
+        )
+
+        if raw_keypoints is None or norm_keypoints is None:
+            raise RuntimeError('키포인트 추출 실패')
+        if keypoint_key:
+            result_cache.put_keypoints(keypoint_key, raw_keypoints, norm_keypoints)
+
+    #3. DTW 비교 (라이브러리 내 K개 최근접 기준) 및 diff 계산
+    report("dtw")
+    dtw_score, distance, ref, test, path, matches = compare_with_nearest_references(mapped_type, norm_keypoints)
+    diff_seq = compute_diff_sequence(ref, test, path)
+
+    #4. LSTM 프레임별 예측
+    report("lstm")
+    labels, confidence = predict_framewise_labels(diff_seq, model_path, resample=config.LSTM_RESAMPLE_TO_EXPECTED_LEN)
+    lstm_score = round(confidence * 100, 2)
+    # 관절별 오차 지표 (top 관절, 렌더링용 이상 선분, 요청 시 응답용 시계열)를 한 번에 계산
+    analytics = analyze_joints(diff_seq, labels, 4)
+    top_joints = analytics["top_joints"]
+    feedback_text = build_feedback_text(lstm_score, dtw_score, labels, top_joints)
+
+    #5. 시각화 영상은 백그라운드 렌더링으로 예약 (점수는 바로 응답)
+    report("schedule_render")
+    comparison_dir = f"output/comparison/{uid}"
+    os.makedirs(comparison_dir, exist_ok=True)
+    comparison_name = f"comparison_{uuid.uuid4().hex}.mp4"
+    comparison_path = os.path.join(comparison_dir, comparison_name)
+
+    video_status = schedule_render(
+        save_path=comparison_path,
+        raw_keypoints=raw_keypoints,
+        norm_keypoints=norm_keypoints,
+        labels=labels,
+        diff_seq=diff_seq,
+        top_joints=top_joints,
+        source_video=video_path,
+        start_frame=start_frame,
+        fast=preview,
+        abnormal=analytics["abnormal"]
+    )
+
+    print(f"[RENDER] 시각화 예약: {comparison_path} ({video_status})")
+
+    #결과 응답(local path)
+    result = {
+        "uid": uid,
+        "pitch_type": pitch_type,
+        "range": [start_frame, end_frame],
+        "pose_mode": pose_mode,
+        "dtw": {
+            "distance": round(distance, 4),
+            "score": dtw_score,
+            "reference": matches[0]["reference"],
+            "neighbors": matches,
+            "description": (
+                "기준 자세와의 유사도 (DTW distance는 낮을수록, score는 높을수록 좋음, "
+                "score는 가장 가까운 기준 자세들의 평균)"
+            )
+        },
+        "lstm": {
+            "score": lstm_score,
+            "description": "AI가 예측한 LSTM 기반 프레임별 동작 안정도 (높을수록 좋음)"
+        },
+        "feedback": feedback_text,
+        "comparison_video_path": comparison_path,
+        "comparison_video_status": video_status,
+        "comparison_video_status_url": f"/video/status/{comparison_name}",
+        "cached": False
+    }
+    if result_key:
+        result_cache.put_result(result_key, result)
+
+    if include_joint_series:
+        series = {
+            "magnitudes": joint_series(analytics),
+            "top_joints": top_joints,
+            "description": "관절(0~16)별 프레임 단위 기준 자세 대비 오차 크기 (DTW 정렬 기준)"
+        }
+        if result_key:
+            result_cache.put_result(make_key("joint_series", result_key), series)
+        result["joint_series"] = series
+    return result
+
+
+# 비동기 분석 작업 큐 (/jobs/analyze_pose)
+analysis_jobs = JobQueue(
+    workers=config.ANALYZE_WORKERS,
+    max_pending=config.ANALYZE_MAX_PENDING,
+    ttl=config.JOB_RESULT_TTL,
+    name="analyze"
+)
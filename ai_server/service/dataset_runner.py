@@ -0,0 +1,186 @@
+# dataset_runner.py
+# 학습용 keypoints 데이터셋 빌드 (병렬 + 재개 가능)
+#   - 영상을 프로세스 풀에 나눠 처리, worker마다 추출 모듈(모델)을 한 번만 로드
+#   - manifest.json의 원본 영상 sha256 + 모델 버전이 그대로면 건너뜀
+#   - .npy와 manifest는 임시 파일에 쓴 뒤 교체 (중단돼도 깨진 파일이 남지 않음)
+import os
+import sys
+import json
+import time
+import hashlib
+import importlib
+import multiprocessing
+from glob import glob
+import numpy as np
+import config
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VIDEO_EXTENSIONS = ('.mov', '.mp4', '.avi', '.mkv')
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 1 << 20
+
+
+def find_videos(learning_dir):
+    video_files = glob(os.path.join(learning_dir, "*", "*"))
+    return sorted(vf for vf in video_files if vf.lower().endswith(VIDEO_EXTENSIONS))
+
+
+# data/keypoints*/{구질}/{영상 이름}.npy
+def output_path_for(video_path, output_dir):
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    return os.path.join(output_dir, video_name.split("_")[0], f"{video_name}.npy")
+
+
+def file_sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def save_npy_atomic(path, array):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.part"
+    with open(tmp_path, "wb") as f:
+        np.save(f, array)
+    os.replace(tmp_path, path)
+
+
+class Manifest:
+    """
+    출력 파일(output_dir 기준 상대 경로)별 원본 영상/해시/모델 버전 기록
+    원본 영상의 크기/mtime이 그대로면 저장된 해시를 재사용 (매번 전체 영상을 다시 읽지 않음)
+    """
+
+    def __init__(self, output_dir):
+        self.path = os.path.join(output_dir, MANIFEST_NAME)
+        self.entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[DATASET] manifest 읽기 실패 → 전체 재생성: {e}")
+        self._by_source = {e["source"]: e for e in self.entries.values()}
+
+    def source_hash(self, video_path):
+        st = os.stat(video_path)
+        entry = self._by_source.get(os.path.abspath(video_path))
+        if entry is not None and entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime:
+            return entry["sha256"]
+        return file_sha256(video_path)
+
+    def is_current(self, key, sha256, model_version, output_path):
+        entry = self.entries.get(key)
+        return (
+            entry is not None and os.path.exists(output_path)
+            and entry["sha256"] == sha256 and entry["model_version"] == model_version
+        )
+
+    # 내용(해시)은 같고 mtime만 바뀐 영상: 다음 실행부터 해시를 다시 계산하지 않도록 갱신
+    def refresh_stat(self, key, video_path):
+        st = os.stat(video_path)
+        entry = self.entries[key]
+        changed = entry["size"] != st.st_size or entry["mtime"] != st.st_mtime
+        entry["size"], entry["mtime"] = st.st_size, st.st_mtime
+        return changed
+
+    def record(self, key, video_path, sha256, model_version, shape):
+        st = os.stat(video_path)
+        entry = {
+            "source": os.path.abspath(video_path),
+            "size": st.st_size,
+            "mtime": st.st_mtime,
+            "sha256": sha256,
+            "model_version": model_version,
+            "shape": list(shape),
+        }
+        self.entries[key] = entry
+        self._by_source[entry["source"]] = entry
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
+
+
+# ---- worker 프로세스 ----
+_extract_fn = None
+
+
+def _init_worker(extract_spec):
+    """extract_spec "모듈:함수" — 모듈 import 시 모델을 로드하므로 worker당 한 번만 실행됨"""
+    global _extract_fn
+    os.chdir(ROOT)
+    sys.path[:0] = [ROOT, os.path.join(ROOT, "train")]
+    module_name, fn_name = extract_spec.split(":")
+    _extract_fn = getattr(importlib.import_module(module_name), fn_name)
+
+
+def _process(task):
+    video_path, output_path = task
+    start = time.perf_counter()
+    try:
+        keypoints = _extract_fn(video_path)
+        if keypoints is None or len(keypoints) == 0:
+            return video_path, None, "키포인트 없음", time.perf_counter() - start
+        keypoints = np.asarray(keypoints)
+        save_npy_atomic(output_path, keypoints)
+        return video_path, keypoints.shape, None, time.perf_counter() - start
+    except Exception as e:
+        return video_path, None, str(e), time.perf_counter() - start
+
+
+def build_keypoint_dataset(learning_dir, output_dir, extract_spec, model_version, workers=None):
+    """
+    learning_dir/*/* 영상을 extract_spec("모듈:함수", 영상 경로 → keypoints 배열)으로 추출해
+    output_dir/{구질}/{이름}.npy로 저장합니다. 원본과 모델 버전이 같으면 건너뜁니다.
+    """
+    workers = workers or config.DATASET_WORKERS
+    videos = find_videos(learning_dir)
+    manifest = Manifest(output_dir)
+
+    tasks = {}
+    skipped = 0
+    refreshed = False
+    for video_path in videos:
+        output_path = output_path_for(video_path, output_dir)
+        key = os.path.relpath(output_path, output_dir)
+        sha256 = manifest.source_hash(video_path)
+        if manifest.is_current(key, sha256, model_version, output_path):
+            refreshed = manifest.refresh_stat(key, video_path) or refreshed
+            skipped += 1
+            continue
+        tasks[video_path] = (output_path, key, sha256)
+    if refreshed:
+        manifest.save()
+
+    print(f"[DATASET] 총 {len(videos)}개 영상 | 최신 {skipped}개 건너뜀 | 추출 {len(tasks)}개 | "
+          f"worker {workers}개 | 모델 {model_version}")
+    if not tasks:
+        return
+
+    wall_start = time.perf_counter()
+    done, failed, frames = 0, 0, 0
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(workers, initializer=_init_worker, initargs=(extract_spec,)) as pool:
+        jobs = [(video_path, output_path) for video_path, (output_path, _, _) in tasks.items()]
+        for video_path, shape, error, elapsed in pool.imap_unordered(_process, jobs):
+            name = os.path.basename(video_path)
+            if error is not None:
+                failed += 1
+                print(f"[DATASET] 실패: {name} → {error}")
+                continue
+            _, key, sha256 = tasks[video_path]
+            manifest.record(key, video_path, sha256, model_version, shape)
+            manifest.save()  # 영상마다 기록 → 중단 후 재실행 시 이어서 처리
+            done += 1
+            frames += shape[0]
+            print(f"[DATASET] ({done + failed}/{len(tasks)}) {name}: {shape[0]}프레임 ({elapsed:.1f}s)")
+
+    wall = time.perf_counter() - wall_start
+    print(f"[DATASET] 완료 {done}개, 실패 {failed}개, 건너뜀 {skipped}개 | {wall:.1f}s | "
+          f"{done / wall * 60:.1f} 영상/분, {frames / wall:.1f} 프레임/s")
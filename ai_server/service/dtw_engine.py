@@ -0,0 +1,77 @@
+# dtw_engine.py
+# 전체 비용 행렬 + anti-diagonal 벡터화 누적으로 계산하는 정확한 DTW
+import math
+import numpy as np
+from scipy.spatial.distance import cdist
+
+
+def sakoe_chiba_mask(n, m, window):
+    """
+    (n, m) 크기 Sakoe-Chiba band 마스크 (True = 허용)
+    길이가 다른 시퀀스는 (0,0)~(n-1,m-1) 대각선을 중심으로 ±window 프레임을 허용합니다.
+    """
+    # 대각선 기울기만큼은 반드시 허용해야 경로가 끊기지 않음
+    radius = max(window, math.ceil(max(n, m) / min(n, m)))
+    center = np.arange(n) * ((m - 1) / (n - 1)) if n > 1 else np.zeros(1)
+    cols = np.arange(m)
+    return np.abs(cols[None, :] - center[:, None]) <= radius
+
+
+def accumulated_cost(cost):
+    """
+    누적 비용 행렬 D (n+1, m+1)를 계산합니다. (D[0,0]=0, 나머지 경계는 inf)
+    D[i,j]는 D[i-1,j], D[i,j-1], D[i-1,j-1]에만 의존하므로
+    같은 anti-diagonal(i+j=k)의 셀은 한 번의 NumPy 연산으로 채울 수 있습니다.
+    """
+    n, m = cost.shape
+    acc = np.full((n + 1, m + 1), np.inf)
+    acc[0, 0] = 0.0
+    for k in range(2, n + m + 1):
+        i = np.arange(max(1, k - m), min(n, k - 1) + 1)
+        j = k - i
+        best_prev = np.minimum(np.minimum(acc[i - 1, j], acc[i, j - 1]), acc[i - 1, j - 1])
+        acc[i, j] = cost[i - 1, j - 1] + best_prev
+    return acc
+
+
+def backtrack_path(acc):
+    """누적 비용 행렬에서 (0,0) → (n-1,m-1) 최적 경로를 복원합니다."""
+    i, j = acc.shape[0] - 1, acc.shape[1] - 1
+    path = [(i - 1, j - 1)]
+    while i > 1 or j > 1:
+        if i == 1:
+            j -= 1
+        elif j == 1:
+            i -= 1
+        else:
+            # 동점이면 대각선 이동을 우선
+            diag, up, left = acc[i - 1, j - 1], acc[i - 1, j], acc[i, j - 1]
+            if diag <= up and diag <= left:
+                i, j = i - 1, j - 1
+            elif up <= left:
+                i -= 1
+            else:
+                j -= 1
+        path.append((i - 1, j - 1))
+    path.reverse()
+    return path
+
+
+def dtw(ref_seq, test_seq, window=None):
+    """
+    ref_seq: (n, D), test_seq: (m, D) 배열
+    window: Sakoe-Chiba band 반경(프레임), None이면 전체 탐색
+    반환: (distance, path) — fastdtw와 같은 형식 (path는 (ref_idx, test_idx) 튜플 리스트)
+    """
+    ref_seq = np.asarray(ref_seq, dtype=np.float64)
+    test_seq = np.asarray(test_seq, dtype=np.float64)
+    if len(ref_seq) == 0 or len(test_seq) == 0:
+        raise ValueError("빈 시퀀스는 DTW를 계산할 수 없습니다.")
+
+    # 프레임 쌍 전체의 유클리드 거리 (n, m)를 한 번에 계산
+    cost = cdist(ref_seq, test_seq, metric="euclidean")
+    if window is not None:
+        cost[~sakoe_chiba_mask(len(ref_seq), len(test_seq), window)] = np.inf
+
+    acc = accumulated_cost(cost)
+    return float(acc[-1, -1]), backtrack_path(acc)
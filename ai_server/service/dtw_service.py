@@ -1,8 +1,10 @@
 # DTW.py
 import math
 import numpy as np
-from scipy.spatial.distance import euclidean
-from fastdtw import fastdtw
+import config
+from service.dtw_engine import dtw
+from service.reference_store import reference_store
+from service.reference_index import reference_index
 
 
 def load_keypoints(file_path):
@@ -14,7 +16,9 @@ def compare_poses(reference_path, test_keypoints):
     reference_path: 기준 자세 .npy 파일 경로 (str)
     test_keypoints: 비교 대상 (numpy 배열 or .npy 경로)
     """
-    ref = load_keypoints(reference_path)
+    # 기준 자세는 저장소에서 조회 (디스크 I/O, flatten은 최초 1회만)
+    ref_entry = reference_store.get(reference_path)
+    ref = ref_entry.keypoints
 
     # test_keypoints가 str일 경우 np.load로 불러오기
     if isinstance(test_keypoints, str):
@@ -27,21 +31,22 @@ def compare_poses(reference_path, test_keypoints):
         raise ValueError(f"잘못된 keypoints 형태입니다: ref={ref.shape}, test={test.shape}")
 
     # 각 프레임별 (17,2) → (34,) flatten
-    ref_seq = [kp[:, :2].flatten() for kp in ref]
-    test_seq = [kp[:, :2].flatten() for kp in test]
+    ref_seq = ref_entry.flat
+    test_seq = test[:, :, :2].reshape(len(test), -1)
 
-    # FastDTW 실행
-    distance, path = fastdtw(ref_seq, test_seq, dist=euclidean)
+    # DTW 실행 (전체 비용 행렬 기반 정확한 DTW)
+    distance, path = dtw(ref_seq, test_seq, window=config.DTW_WINDOW)
     print(f"DTW 거리: {distance:.2f}")
 
     return distance, ref, test, path
 
 
+#DTW 경로를 따라 (test - ref) 프레임 차이 (len(path), 34) — 경로 전체를 인덱스 배열로 한 번에 gather
 def compute_diff_sequence(ref, test, path):
-    ref_seq = [r[:, :2].flatten() for r in ref]
-    test_seq = [t[:, :2].flatten() for t in test]
-    diff_seq = [test_seq[j] - ref_seq[i] for i, j in path]
-    return np.array(diff_seq)
+    ref_seq = ref[:, :, :2].reshape(len(ref), -1)
+    test_seq = test[:, :, :2].reshape(len(test), -1)
+    path = np.asarray(path, dtype=np.intp).reshape(-1, 2)
+    return test_seq[path[:, 1]] - ref_seq[path[:, 0]]
 
 
 def compute_dtw_score(distance):
@@ -54,4 +59,32 @@ def compute_dtw_score(distance):
 def compare_poses_with_score(reference_path, norm_keypoints):
     distance, ref, test, path = compare_poses(reference_path, norm_keypoints)
     dtw_score = compute_dtw_score(distance)
-    return dtw_score, distance, ref, test, path
\ No newline at end of file
+    return dtw_score, distance, ref, test, path
+
+#구질 라이브러리 전체에서 K개 최근접 기준 자세와 비교
+def compare_with_nearest_references(pitch_type, norm_keypoints, k=None):
+    """
+    반환: (dtw_score, distance, ref, test, path, matches)
+    - dtw_score: K개 기준 점수 평균
+    - distance/ref/path: 가장 가까운 기준 기준 (diff_seq 계산용)
+    - matches: [{"reference", "distance", "score"}, ...] 거리 오름차순
+    """
+    test = np.array(norm_keypoints, dtype=np.float32)
+    if test.ndim != 3:
+        raise ValueError(f"잘못된 keypoints 형태입니다: test={test.shape}")
+    test_seq = test[:, :, :2].reshape(len(test), -1)
+
+    matches = reference_index.nearest(pitch_type, test_seq, k or config.REFERENCE_TOP_K)
+    best = matches[0]
+    summary = [
+        {
+            "reference": m["entry"].name,
+            "distance": round(m["distance"], 4),
+            "score": compute_dtw_score(m["distance"])
+        }
+        for m in matches
+    ]
+    dtw_score = round(float(np.mean([m["score"] for m in summary])), 2)
+    print(f"DTW 최근접 기준: {best['entry'].name} (거리 {best['distance']:.2f}, K={len(matches)})")
+
+    return dtw_score, best["distance"], best["entry"].keypoints, test, best["path"], summary
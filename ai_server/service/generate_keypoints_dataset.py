@@ -1,7 +1,7 @@
 import sys, os
-from glob import glob
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from service.movenet_service import extract_keypoints_from_video
+from service.movenet_service import extract_keypoints_from_video, pose_model_version
+from service.dataset_runner import build_keypoint_dataset
 
 #경로 설정
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
@@ -9,18 +9,18 @@ LEARNING_DIR = os.path.join(BASE_PATH, "..", "data", "Learning")
 OUTPUT_DIR = os.path.join(BASE_PATH, "..", "data", "keypoints")
 
 
-#.MOV 등 확장자 필터링
-video_files = glob(os.path.join(LEARNING_DIR, "*", "*"))
-video_files = [vf for vf in video_files if vf.lower().endswith(('.mov', '.mp4', '.avi', '.mkv'))]
-print(f"총 {len(video_files)}개 영상 탐색")
+#서버와 같은 추출 방식의 raw keypoints (N, 17, 3)
+def extract_raw_keypoints(video_path):
+    raw_keypoints, _ = extract_keypoints_from_video(video_path, OUTPUT_DIR)
+    return raw_keypoints
 
 
-#MoveNet 기반 키포인트 추출
-for video_path in video_files:
-    try:
-        extract_keypoints_from_video(video_path, OUTPUT_DIR)
-    except Exception as e:
-        print(f"오류 발생: {video_path} → {e}")
-
-
-print("모든 영상의 키포인트 추출 완료.")
\ No newline at end of file
+#MoveNet 기반 키포인트 추출 (worker마다 모델 1개)
+# 사용법: python service/generate_keypoints_dataset.py [worker 수]
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    build_keypoint_dataset(
+        LEARNING_DIR, OUTPUT_DIR, "service.generate_keypoints_dataset:extract_raw_keypoints",
+        pose_model_version(), workers
+    )
+    print("모든 영상의 키포인트 추출 완료.")
@@ -0,0 +1,128 @@
+# job_service.py
+# 프로세스 내 작업 큐 (worker 스레드 풀 + bounded queue)
+import time
+import uuid
+import queue
+import threading
+import traceback
+
+
+class QueueFullError(Exception):
+    """대기 중인 작업이 최대치에 도달함 (HTTP 429로 응답)"""
+
+
+class JobQueue:
+    """
+    submit(fn, ...)으로 작업을 넣으면 job_id를 즉시 반환하고 worker 스레드가 실행합니다.
+    fn은 progress(stage) 키워드 인자를 받아 단계별 진행 상황을 보고합니다.
+
+    - workers: 동시에 실행할 작업 수
+    - max_pending: 대기열 최대 길이 (초과 시 QueueFullError)
+    - ttl: 완료된 작업 정보 보관 시간(초)
+    """
+
+    def __init__(self, workers=2, max_pending=16, ttl=3600, name="jobs"):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._threads = []
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._worker, name=f"{self.name}-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            self._started = True
+        print(f"[{self.name}] worker {self.workers}개 시작 (대기열 최대 {self.max_pending})")
+
+    def submit(self, fn, *args, **kwargs):
+        self.start()
+        self._cleanup()
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "status": "queued",
+            "stage": None,
+            "stages": [],
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        try:
+            self._queue.put_nowait((job_id, fn, args, kwargs))
+        except queue.Full:
+            with self._lock:
+                del self._jobs[job_id]
+            raise QueueFullError(f"대기 중인 작업이 너무 많습니다 (최대 {self.max_pending}개)")
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {k: (list(v) if isinstance(v, list) else v) for k, v in job.items()}
+
+    def stats(self):
+        with self._lock:
+            running = sum(1 for j in self._jobs.values() if j["status"] == "running")
+        return {
+            "workers": self.workers,
+            "running": running,
+            "pending": self._queue.qsize(),
+            "max_pending": self.max_pending,
+        }
+
+    # 단계 전환 기록 (이전 단계 소요 시간 확정)
+    def _progress(self, job_id, stage):
+        now = time.time()
+        with self._lock:
+            job = self._jobs[job_id]
+            if job["stages"] and job["stages"][-1]["elapsed"] is None:
+                last = job["stages"][-1]
+                last["elapsed"] = round(now - last["started_at"], 3)
+            if stage is not None:
+                job["stages"].append({"stage": stage, "started_at": now, "elapsed": None})
+            job["stage"] = stage
+
+    def _worker(self):
+        while True:
+            job_id, fn, args, kwargs = self._queue.get()
+            with self._lock:
+                self._jobs[job_id]["status"] = "running"
+                self._jobs[job_id]["started_at"] = time.time()
+            try:
+                result = fn(*args, progress=lambda stage: self._progress(job_id, stage), **kwargs)
+                self._progress(job_id, None)
+                with self._lock:
+                    self._jobs[job_id].update(status="done", result=result, finished_at=time.time())
+            except Exception as e:
+                traceback.print_exc()
+                self._progress(job_id, None)
+                with self._lock:
+                    self._jobs[job_id].update(status="failed", error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+
+    # 오래된 완료 작업 정리
+    def _cleanup(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job["finished_at"] is not None and now - job["finished_at"] > self.ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
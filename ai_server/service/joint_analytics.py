@@ -0,0 +1,71 @@
+# joint_analytics.py
+# diff_seq (T, 34)로부터 관절별 오차 지표를 한 번에(벡터화) 계산
+import numpy as np
+
+# 관절 연결 정의 (시각화 선분)
+POSE_PAIRS = [
+    (0, 1), (1, 3), (0, 2), (2, 4),
+    (5, 7), (7, 9), (6, 8), (8, 10),
+    (5, 6), (5, 11), (6, 12),
+    (11, 12), (11, 13), (13, 15),
+    (12, 14), (14, 16)
+]
+
+# 관절쌍 평균 정규화 오차가 이 값을 넘으면 이상(빨강)으로 표시
+ABNORMAL_THRESHOLD = 0.22
+
+# 상위 오차 관절 집계 시 무시하는 작은 오차
+JOINT_ERROR_MIN = 0.1
+
+
+def joint_magnitudes(diff_seq):
+    """(T, 34) → 관절별 차이 크기 (T, 17)"""
+    diff_seq = np.asarray(diff_seq, dtype=np.float32)
+    return np.linalg.norm(diff_seq.reshape(len(diff_seq), 17, 2), axis=2)
+
+
+def normalized_magnitudes(mags):
+    """프레임별 최대값으로 나눈 0~1 정규화 (T, 17)"""
+    max_mag = mags.max(axis=1, keepdims=True)
+    max_mag[max_mag <= 0] = 1.0
+    return mags / max_mag
+
+
+def limb_abnormal_mask(norm_mags, pose_pairs=POSE_PAIRS, threshold=ABNORMAL_THRESHOLD):
+    """관절쌍(선분)별 이상 여부 (T, len(pose_pairs)) — 두 관절 정규화 오차 평균 > threshold"""
+    pairs = np.asarray(pose_pairs)
+    return (norm_mags[:, pairs[:, 0]] + norm_mags[:, pairs[:, 1]]) / 2.0 > threshold
+
+
+def top_joints_from_magnitudes(mags, labels, top_k=4):
+    """이상(label=1) 프레임에서 오차 합이 큰 관절 top_k"""
+    safe_len = min(len(mags), len(labels))
+    wrong = np.asarray(labels[:safe_len]) == 1
+    masked = mags[:safe_len] * (mags[:safe_len] > JOINT_ERROR_MIN)
+    joint_error_sum = masked[wrong].sum(axis=0) if wrong.any() else np.zeros(mags.shape[1])
+
+    sorted_idx = np.argsort(joint_error_sum)[::-1]
+    return [int(j) for j in sorted_idx[:top_k] if joint_error_sum[j] > 0]
+
+
+def analyze_joints(diff_seq, labels, top_k=4):
+    """
+    렌더링/피드백/응답에 필요한 관절 지표를 한 번에 계산합니다.
+    반환: {
+        "magnitudes": (T, 17), "normalized": (T, 17),
+        "abnormal": (T, len(POSE_PAIRS)) bool, "top_joints": [int, ...]
+    }
+    """
+    mags = joint_magnitudes(diff_seq)
+    normalized = normalized_magnitudes(mags)
+    return {
+        "magnitudes": mags,
+        "normalized": normalized,
+        "abnormal": limb_abnormal_mask(normalized),
+        "top_joints": top_joints_from_magnitudes(mags, labels, top_k),
+    }
+
+
+def joint_series(analytics, decimals=4):
+    """응답 JSON용 관절별 시계열 [[프레임별 값...] × 17]"""
+    return np.round(analytics["magnitudes"].T, decimals).tolist()
@@ -1,6 +1,9 @@
 import numpy as np
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.sequence import pad_sequences
+from service.model_registry import ModelRegistry
+from service.micro_batcher import MicroBatcher
+from service.tflite_backend import load_tflite_predictor, tflite_model_path
+import threading
+import config
 import os
 
 # 구질별 기대 입력 길이
@@ -11,11 +14,105 @@ EXPECTED_LEN = {
     "thumbless": 292
 }
 
+FEATURE_DIM = 34
+
+
+def pitch_type_from_path(model_path):
+    return os.path.basename(model_path).replace("lstm_", "").replace(".h5", "")
+
+
+# 모델 로드 + 컴파일된 predict 함수 생성 + 더미 입력으로 warm-up
+# (TensorFlow는 모델을 처음 로드할 때 import)
+def load_lstm_predictor(model_path):
+    import tensorflow as tf
+    from tensorflow.keras.models import load_model
+
+    model = load_model(model_path, compile=False)
+
+    # 고정 signature로 한 번만 trace (동시 호출에 안전한 concrete function)
+    @tf.function(input_signature=[tf.TensorSpec([None, None, FEATURE_DIM], tf.float32)])
+    def predict(x):
+        return model(x, training=False)
+
+    maxlen = EXPECTED_LEN.get(pitch_type_from_path(model_path), 278)
+    predict(tf.zeros((1, maxlen, FEATURE_DIM), dtype=tf.float32))
+    return predict
+
+
+# 확장자로 백엔드 선택 (.tflite → TFLite Interpreter, 그 외 → Keras)
+def load_lstm_backend(path):
+    if path.endswith(".tflite"):
+        return load_tflite_predictor(path)
+    return load_lstm_predictor(path)
+
+
+# 프로세스 전역 LSTM 레지스트리 (모델 파일 mtime이 바뀌면 자동 재로드)
+lstm_registry = ModelRegistry(load_lstm_backend, name="LSTM")
+
+
+def lstm_model_path(pitch_type):
+    return os.path.join("model", f"lstm_{pitch_type}.h5")
+
+
+# 설정된 백엔드(config.INFERENCE_BACKEND)에서 실제로 로드할 파일
+def lstm_backend_path(model_path):
+    if config.INFERENCE_BACKEND == "tflite":
+        return tflite_model_path(os.path.splitext(os.path.basename(model_path))[0])
+    return model_path
+
+
+# 캐시 키에 쓰는 모델 버전 (모델 파일이 바뀌면 달라짐)
+def lstm_model_version(model_path):
+    path = lstm_backend_path(model_path)
+    return f"{os.path.basename(path)}@{int(os.path.getmtime(path))}"
+
+
+# 구질(모델)별 micro-batcher: 동시 요청의 (maxlen, 34) 입력을 모아 한 번에 추론
+_lstm_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_lstm_batcher(model_path):
+    with _batchers_lock:
+        batcher = _lstm_batchers.get(model_path)
+        if batcher is None:
+            def run_batch(items):
+                # 실행 시점에 레지스트리에서 조회 (hot reload 반영)
+                predict = lstm_registry.get(lstm_backend_path(model_path))
+                preds = np.asarray(predict(np.stack(items).astype(np.float32)))  # (B, maxlen, 1)
+                return list(preds)
+
+            batcher = MicroBatcher(
+                run_batch,
+                max_batch=config.LSTM_BATCH_SIZE,
+                max_wait_ms=config.LSTM_BATCH_WAIT_MS,
+                name=f"lstm-{pitch_type_from_path(model_path)}"
+            )
+            _lstm_batchers[model_path] = batcher
+        return batcher
+
+
+# 서버 시작 시 모든 구질 모델을 미리 로드
+def warm_up_lstm_models():
+    lstm_registry.warm_up([lstm_backend_path(lstm_model_path(p)) for p in EXPECTED_LEN])
+
+
+# (T, D) 시퀀스를 length 프레임으로 선형 보간
+def resample_sequence(seq, length):
+    seq = np.asarray(seq, dtype=np.float32)
+    positions = np.linspace(0, len(seq) - 1, length)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, len(seq) - 1)
+    weight = (positions - lower)[:, None].astype(np.float32)
+    return seq[lower] * (1 - weight) + seq[upper] * weight
+
+
 # 추론 함수
 # LSTM 학습 모델을 로드하여 diff_seq를 프레임별로 예측
-def predict_framewise_labels(diff_seq, model_path):
+# resample=True면 자르기/패딩 대신 EXPECTED_LEN으로 리샘플해 예측하고, 결과를 원래 길이로 되돌림
+def predict_framewise_labels(diff_seq, model_path, resample=False):
     # pitch_type 추출
-    pitch_type = os.path.basename(model_path).replace("lstm_", "").replace(".h5", "")
+    pitch_type = pitch_type_from_path(model_path)
     maxlen = EXPECTED_LEN.get(pitch_type, 278)
 
     # 입력 길이 확인
@@ -26,30 +123,35 @@ def predict_framewise_labels(diff_seq, model_path):
     if input_len < 200:
         raise ValueError("영상 길이가 너무 짧습니다. 전체 투구 동작이 포함되도록 촬영해주세요.")
 
-    # 모델 로드
-    model = load_model(model_path)
-
-    # 길이 조정 (길면 자르고, 짧으면 패딩)
-    if input_len > maxlen:
+    # 길이 조정 (리샘플 또는 길면 자르고, 짧으면 패딩)
+    if resample:
+        diff_seq = resample_sequence(diff_seq, maxlen)
+        print(f"[LSTM] 입력 시퀀스를 {maxlen}프레임으로 리샘플 (원래 {input_len})")
+    elif input_len > maxlen:
         diff_seq = diff_seq[:maxlen]
         print(f"[LSTM] 입력 시퀀스가 길어 {maxlen}프레임으로 자름 (원래 {input_len})")
     elif input_len < maxlen:
-        diff_seq = pad_sequences([diff_seq], padding='post', maxlen=maxlen, dtype='float32')[0]
+        diff_seq = np.pad(np.asarray(diff_seq, dtype=np.float32), ((0, maxlen - input_len), (0, 0)))
         print(f"[LSTM] 입력 시퀀스가 짧아 {maxlen}프레임까지 패딩함 (원래 {input_len})")
     else:
         print(f"[LSTM] 입력 시퀀스 길이 {maxlen}프레임 (패딩 불필요)")
 
-    # 모델 입력 형태로 변환 (1, maxlen, feature_dim)
-    padded = np.expand_dims(diff_seq, axis=0)
-
-    # 예측
-    preds = model.predict(padded)  # shape: (1, T, 1)
-    framewise = np.squeeze(preds[0])
+    # 예측 (같은 구질의 동시 요청과 묶어서 한 번에 추론)
+    preds = get_lstm_batcher(model_path)(np.asarray(diff_seq, dtype=np.float32))  # shape: (T, 1)
+    framewise = np.squeeze(preds)
 
     # 단일 값일 경우 numpy array로 변환
     if framewise.ndim == 0:
         framewise = np.array([framewise])
 
+    # 리샘플한 경우 프레임별 확률을 원래 diff_seq 길이로 되돌림 (라벨이 DTW 경로 프레임과 맞도록)
+    if resample:
+        confidence = float(np.mean(framewise))
+        framewise = np.interp(np.linspace(0, maxlen - 1, input_len), np.arange(maxlen), framewise)
+        labels = (framewise > 0.5).astype(int).tolist()
+        print(f"[LSTM] 예측 완료 | pitch_type={pitch_type} | frames={len(labels)} | conf={confidence:.2f}")
+        return labels, confidence
+
     # 프레임별 라벨(0/1) 및 신뢰도 계산
     labels = (framewise > 0.5).astype(int).tolist()[:len(diff_seq)]
     confidence = float(np.mean(framewise[:len(diff_seq)]))
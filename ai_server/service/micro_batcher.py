@@ -0,0 +1,73 @@
+# micro_batcher.py
+# 동시 요청의 입력을 모아 한 번의 모델 호출로 처리하는 micro-batching
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """
+    submit(item)으로 들어온 입력을 최대 max_batch개 또는 max_wait_ms까지 모아
+    batch_fn(items) → results(입력 순서와 같은 리스트)를 한 번 호출합니다.
+    각 호출자는 Future로 자기 결과만 받습니다.
+    """
+
+    def __init__(self, batch_fn, max_batch=8, max_wait_ms=5, name="batch"):
+        self.batch_fn = batch_fn
+        self.max_batch = max(max_batch, 1)
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name=f"{self.name}-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, item):
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item):
+        return self.submit(item).result()
+
+    # 첫 입력을 받은 뒤 max_wait 동안(또는 max_batch까지) 추가 입력을 모음
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=max(remaining, 0)) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._collect()
+            items = [item for item, _ in batch]
+            try:
+                results = self.batch_fn(items)
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            self.batches += 1
+            self.items += len(batch)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
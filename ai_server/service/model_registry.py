@@ -0,0 +1,60 @@
+# model_registry.py
+# 모델 파일을 프로세스당 한 번만 로드하고, 파일이 바뀌면(mtime) 다시 로드하는 레지스트리
+import os
+import threading
+import time
+
+
+class ModelRegistry:
+    """
+    경로별로 loader(path)가 만든 predict 함수를 캐시합니다.
+
+    - 처음 요청 시(또는 warm_up 시) 로드 + warm-up
+    - get() 호출마다 파일 mtime을 확인하여 바뀌었으면 새 모델로 교체 (hot reload)
+    - 교체 중에도 기존 predict 함수는 그대로 사용 가능 (진행 중인 요청에 영향 없음)
+    """
+
+    def __init__(self, loader, name="model"):
+        self.loader = loader
+        self.name = name
+        self._entries = {}  # path → (mtime, predict_fn)
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def get(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"모델 파일이 없습니다: {path}")
+        mtime = os.path.getmtime(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+
+        # 같은 모델을 여러 요청이 동시에 로드하지 않도록 경로별 lock
+        with self._path_lock(path):
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                return entry[1]
+
+            action = "재로드" if entry is not None else "로드"
+            start = time.perf_counter()
+            predict_fn = self.loader(path)
+            self._entries[path] = (mtime, predict_fn)
+            print(f"[{self.name}] {action} 완료: {path} ({time.perf_counter() - start:.2f}s)")
+            return predict_fn
+
+    def warm_up(self, paths):
+        for path in paths:
+            if not os.path.exists(path):
+                print(f"[{self.name}] warm-up 스킵 (파일 없음): {path}")
+                continue
+            try:
+                self.get(path)
+            except Exception as e:
+                print(f"[{self.name}] warm-up 실패: {path} → {e}")
+
+    def loaded(self):
+        return list(self._entries.keys())
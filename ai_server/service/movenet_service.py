@@ -1,39 +1,270 @@
 #Movenet.py
 import numpy as np
-import tensorflow as tf
 import cv2
 import os
+import threading
+import functools
+import config
+from service.pose_pipeline import PosePipeline
+from service.micro_batcher import MicroBatcher
+from service.model_registry import ModelRegistry
+from service.tflite_backend import load_tflite_predictor, tflite_model_path
+from service.roi_tracker import RoiTracker, crop_to_image_box, crop_to_full
+
+# MoveNet 모델 (config.INFERENCE_BACKEND: "keras"=SavedModel, "tflite"=변환 모델)
+# import 시점에는 TensorFlow/모델을 로드하지 않음 → get_movenet() 또는 warm_up_movenet()에서 로드
+#   thunder  : 256×256, 정확도 우선
+#   lightning: 192×192, 속도 우선
+MOVENET_VARIANTS = {
+    "thunder": {"name": "movenet_thunder", "size": 256},
+    "lightning": {"name": "movenet_lightning", "size": 192},
+}
+
+# 포즈 추정 모드: 단일 모델 또는 adaptive(전체 Lightning + 스윙/릴리스 구간만 Thunder)
+POSE_MODES = ("thunder", "lightning", "adaptive")
+
+
+def movenet_model_file(variant="thunder"):
+    name = MOVENET_VARIANTS[variant]["name"]
+    if config.INFERENCE_BACKEND == "tflite":
+        return tflite_model_path(name)
+    return os.path.join("model", name)
+
+
+# 모델 버전/존재 확인에 쓰는 파일 (SavedModel은 디렉터리 안의 saved_model.pb — 디렉터리 mtime은 내용 교체 시 안 바뀜)
+def _model_marker(path):
+    return os.path.join(path, "saved_model.pb") if os.path.isdir(path) else path
+
+
+# 캐시 키 / 데이터셋 manifest에 쓰는 모델 버전 (모델을 로드하지 않고 파일 mtime으로 계산)
+def movenet_model_version(variant="thunder"):
+    path = movenet_model_file(variant)
+    return f"{os.path.basename(path)}@{int(os.path.getmtime(_model_marker(path)))}"
+
+
+# 모드에서 사용하는 모델 목록
+def pose_mode_variants(mode):
+    return ("lightning", "thunder") if mode == "adaptive" else (mode,)
 
-# GPU 설정
-gpus = tf.config.list_physical_devices('GPU')
-if gpus:
-    try:
-        for gpu in gpus:
-            tf.config.experimental.set_memory_growth(gpu, True)
-        print(f"GPU 사용 설정 완료: {len(gpus)}개 GPU 감지됨")
-    except RuntimeError as e:
-        print(f"GPU 설정 오류: {e}")
-else:
-    print("GPU 사용 불가. CPU로 실행됩니다.")
 
-# MoveNet Thunder 모델 로드
-MODEL_PATH = os.path.join("model", "movenet_thunder")
+# 모델 파일이 있는지
+def movenet_model_available(variant="thunder"):
+    return os.path.exists(_model_marker(movenet_model_file(variant)))
 
-print(f"MoveNet Thunder 모델 로딩 중... ({MODEL_PATH})")
-movenet = tf.saved_model.load(MODEL_PATH)
-movenet_fn = movenet.signatures['serving_default']
-print("MoveNet 모델 로드 완료 (GPU 사용 가능)")
+
+# 모드에서 쓰는 모델이 모두 있어야 사용 가능
+def pose_mode_available(mode):
+    return all(movenet_model_available(v) for v in pose_mode_variants(mode))
+
+
+# 캐시 키에 쓰는 포즈 모드 버전 (모드 + 사용하는 모델 버전)
+def pose_model_version(mode=None):
+    mode = mode or config.POSE_MODE
+    versions = [movenet_model_version(v) for v in pose_mode_variants(mode)]
+    if mode == "adaptive":
+        versions.append(f"ratio={config.ADAPTIVE_SPEED_RATIO},margin={config.ADAPTIVE_MARGIN}")
+    if config.POSE_TARGET_FPS:
+        versions.append(f"fps={config.POSE_TARGET_FPS},conf={config.POSE_MIN_CONFIDENCE}")
+    if config.POSE_ROI:
+        versions.append(f"roi={config.ROI_MIN_SCORE},{config.ROI_SCALE},{config.ROI_SUB_BATCH}")
+    return f"{mode}:" + "+".join(versions)
+
+
+# GPU 설정 (처음 모델을 로드할 때 한 번)
+_gpus_configured = False
+
+def configure_gpus(tf):
+    global _gpus_configured
+    if _gpus_configured:
+        return
+    _gpus_configured = True
+    gpus = tf.config.list_physical_devices('GPU')
+    if gpus:
+        try:
+            for gpu in gpus:
+                tf.config.experimental.set_memory_growth(gpu, True)
+            print(f"GPU 사용 설정 완료: {len(gpus)}개 GPU 감지됨")
+        except RuntimeError as e:
+            print(f"GPU 설정 오류: {e}")
+    else:
+        print("GPU 사용 불가. CPU로 실행됩니다.")
+
+
+class MoveNetModel:
+    """
+    로드된 MoveNet 1개 (SavedModel 또는 .tflite, size는 MOVENET_VARIANTS의 입력 해상도)
+
+    - preprocess(frames): 같은 크기 uint8 RGB (N, H, W, 3) → (N, size, size, 3) int32
+    - run(input_batch): → keypoints (N, 17, 3) numpy
+      좌표는 resize_with_pad 입력 기준 0~1이므로 모델 해상도와 무관하게 같은 형식
+    """
+
+    def __init__(self, path, size):
+        import tensorflow as tf
+        configure_gpus(tf)
+        self.path = path
+        self.size = size
+
+        # 전처리(resize_with_pad/cast): 영상마다 해상도가 다르므로 요청별로 수행
+        @tf.function(input_signature=[tf.TensorSpec([None, None, None, 3], tf.uint8)])
+        def preprocess(frames):
+            input_batch = tf.image.resize_with_pad(frames, size, size)
+            return tf.cast(input_batch, dtype=tf.int32)
+        self.preprocess = preprocess
+
+        # ROI 전처리: 프레임별 box(원본 프레임 기준 0~1, 범위 밖은 0으로 채움)를 잘라 size×size로 resize
+        @tf.function(input_signature=[
+            tf.TensorSpec([None, None, None, 3], tf.uint8), tf.TensorSpec([None, 4], tf.float32)
+        ])
+        def crop_and_resize(frames, boxes):
+            crops = tf.image.crop_and_resize(
+                tf.cast(frames, tf.float32), boxes, tf.range(tf.shape(boxes)[0]), [size, size]
+            )
+            return tf.cast(crops, dtype=tf.int32)
+        self.crop_and_resize = crop_and_resize
+
+        if path.endswith(".tflite"):
+            self.tflite = load_tflite_predictor(path)
+            self.supports_batch = False
+            print("MoveNet TFLite 모델 로드 완료 (CPU)")
+            return
+
+        self.tflite = None
+        movenet = tf.saved_model.load(path)
+        movenet_fn = movenet.signatures['serving_default']
+        self._movenet = movenet
+
+        # signature의 배치 차원이 고정(1)인지 확인 (TF Hub singlepose 모델은 1로 고정)
+        input_spec = list(movenet_fn.structured_input_signature[1].values())[0]
+        self.supports_batch = supports_batch = input_spec.shape[0] is None
+
+        # 추론: 배치당 1회만 호출
+        @tf.function(input_signature=[tf.TensorSpec([None, size, size, 3], tf.int32)])
+        def run_graph(input_batch):
+            if supports_batch:
+                return movenet_fn(input_batch)['output_0'][:, 0, :, :]
+            # 배치 차원이 1로 고정된 모델은 그래프 내부에서 프레임별로 실행
+            return tf.map_fn(
+                lambda img: movenet_fn(tf.expand_dims(img, axis=0))['output_0'][0, 0, :, :],
+                input_batch,
+                fn_output_signature=tf.float32
+            )
+        self._run_graph = run_graph
+
+        # 더미 입력으로 warm-up (그래프 trace)
+        self.run(self.preprocess(np.zeros((1, size, size, 3), dtype=np.uint8)))
+        print(f"MoveNet 모델 로드 완료 ({os.path.basename(path)}, 배치 signature 지원={supports_batch})")
+
+    def run(self, input_batch):
+        if self.tflite is not None:
+            return self.tflite(np.asarray(input_batch))[:, 0, :, :]
+        return self._run_graph(input_batch).numpy()
+
+
+# 레지스트리 loader: 경로에 해당하는 variant의 입력 크기로 로드
+def load_movenet_model(path):
+    for variant, spec in MOVENET_VARIANTS.items():
+        if movenet_model_file(variant) == path:
+            return MoveNetModel(path, spec["size"])
+    raise ValueError(f"알 수 없는 MoveNet 모델 경로: {path}")
+
+
+# 프로세스 전역 MoveNet 레지스트리 (모델 파일 mtime이 바뀌면 자동 재로드)
+movenet_registry = ModelRegistry(load_movenet_model, name="MoveNet")
+
+
+def get_movenet(variant="thunder"):
+    return movenet_registry.get(movenet_model_file(variant))
+
+
+# 서버 시작 시 설정된 모드(config.POSE_MODE)의 모델을 미리 로드 (app.py warm-up 단계)
+def warm_up_movenet():
+    movenet_registry.warm_up([movenet_model_file(v) for v in pose_mode_variants(config.POSE_MODE)])
 
 
 #키 포인트 추출
-def detect_pose(image):
-    input_image = tf.image.resize_with_pad(image, 256, 256)
-    input_image = tf.expand_dims(input_image, axis=0)
-    input_image = tf.cast(input_image, dtype=tf.int32)
-    outputs = movenet_fn(input_image)
-    keypoints = outputs['output_0'].numpy()[0, 0, :, :]  # (17, 3)
+def detect_pose(image, variant="thunder"):
+    model = get_movenet(variant)
+    return model.run(model.preprocess(np.asarray(image)[None]))[0]  # (17, 3)
+
+#배치 키 포인트 추출
+# 모델별 micro-batcher: 동시 업로드의 프레임 배치를 이어 붙여 한 번에 추론하고 요청별로 다시 나눔
+_pose_batchers = {}
+_batchers_lock = threading.Lock()
+
+def get_pose_batcher(variant):
+    with _batchers_lock:
+        batcher = _pose_batchers.get(variant)
+        if batcher is None:
+            def run_merged(batches):
+                sizes = [len(b) for b in batches]
+                keypoints = get_movenet(variant).run(np.concatenate(batches, axis=0))
+                return np.split(keypoints, np.cumsum(sizes)[:-1])
+
+            batcher = MicroBatcher(
+                run_merged,
+                max_batch=config.POSE_MERGE_BATCHES,
+                max_wait_ms=config.POSE_MERGE_WAIT_MS,
+                name=f"movenet-{variant}"
+            )
+            _pose_batchers[variant] = batcher
+        return batcher
+
+def detect_pose_batch(frames_rgb, variant="thunder"):
+    """
+    RGB 프레임 묶음에서 keypoints를 한 번에 추출합니다.
+    입력: 같은 크기의 RGB 프레임 리스트 (N개)
+    출력: keypoints (N, 17, 3)
+    """
+    model = get_movenet(variant)
+    return _run_input_batch(model, model.preprocess(np.stack(frames_rgb).astype(np.uint8)), variant)
+
+# 전처리된 입력 배치 추론 (설정 시 동시 요청과 합쳐서)
+def _run_input_batch(model, input_batch, variant):
+    if config.POSE_MERGE_BATCHES > 1:
+        return get_pose_batcher(variant)(input_batch)
+    return model.run(input_batch)
+
+# ROI 추론: tracker의 crop으로 config.ROI_SUB_BATCH 프레임씩 잘라 추론하고 단위마다 crop 갱신
+# (배치 전체가 오래된 crop 하나를 쓰지 않도록), crop이 없으면 나머지 프레임을 전체 프레임으로 추론
+def detect_pose_batch_roi(frames_rgb, tracker, variant="thunder"):
+    keypoints = np.zeros((len(frames_rgb), 17, 3), dtype=np.float32)
+    rerun = []  # 전체 프레임으로 추론할 위치 (crop 없음 + crop에서 놓친 프레임) → 마지막에 한 배치로
+    start = 0
+    while start < len(frames_rgb):
+        if tracker.crop is None:
+            rerun.extend(range(start, len(frames_rgb)))
+            break
+        end = min(start + max(config.ROI_SUB_BATCH, 1), len(frames_rgb))
+        keypoints[start:end], lost = _detect_pose_crop(frames_rgb[start:end], tracker, variant)
+        rerun.extend(start + lost)
+        # 단위 마지막 프레임을 놓쳤으면 그 crop으로 계속 갈 수 없으므로 나머지는 전체 프레임
+        if len(lost) and lost[-1] == end - start - 1:
+            tracker.crop = None
+        else:
+            tracker.update(keypoints[end - 1])
+        start = end
+
+    if rerun:
+        keypoints[rerun] = detect_pose_batch([frames_rgb[i] for i in rerun], variant)
+    if len(keypoints):
+        tracker.update(keypoints[-1])
     return keypoints
 
+# crop 추론 → (전체 프레임 좌표 keypoints, 몸통을 놓쳤거나 손목/발목이 잘린 프레임 위치)
+def _detect_pose_crop(frames_rgb, tracker, variant):
+    model = get_movenet(variant)
+    frames = np.stack(frames_rgb).astype(np.uint8)
+    h, w = frames.shape[1:3]
+    boxes = np.repeat(crop_to_image_box(tracker.crop, h, w)[None], len(frames), axis=0)
+    crop_keypoints = _run_input_batch(model, model.crop_and_resize(frames, boxes), variant)
+    keypoints = crop_to_full(crop_keypoints, tracker.crop)
+
+    lost = np.flatnonzero(tracker.lost(crop_keypoints))
+    tracker.cropped_frames += len(frames) - len(lost)
+    tracker.fallback_frames += len(lost)
+    return keypoints, lost
+
 # 가로 영상일 경우 세로로 회전
 def rotate_frame_if_needed(frame):  # 수정
     h, w = frame.shape[:2]
@@ -68,43 +299,199 @@ def normalize_keypoints(keypoints):
     normalized = np.hstack([normalized_xy, keypoints[:, 2:3]])
     return normalized
 
-#keyPoint 관절 추출
-def extract_keypoints_from_video(video_path, output_folder):
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print(f"영상 열기 실패: {video_path}")
-        return None, None
+# 관절 정규화 (배치)
+def normalize_keypoints_batch(keypoints):
+    """
+    normalize_keypoints의 벡터화 버전입니다.
+    입력: keypoints (N, 17, 3)
+    출력: normalized_keypoints (N, 17, 3)
+    """
+    keypoints = np.asarray(keypoints)
+    shoulder_center = (keypoints[:, 5, :2] + keypoints[:, 6, :2]) / 2
+    hip_center = (keypoints[:, 11, :2] + keypoints[:, 12, :2]) / 2
+
+    torso_length = np.linalg.norm(shoulder_center - hip_center, axis=1)
+    torso_length = np.where(torso_length < 1e-5, 1.0, torso_length)
 
-    raw_keypoints = []
-    norm_keypoints = []
-    frame_count = 0
+    normalized_xy = (keypoints[:, :, :2] - hip_center[:, None, :]) / torso_length[:, None, None]
+    return np.concatenate([normalized_xy, keypoints[:, :, 2:3]], axis=2)
 
+# 프레임을 batch_size 단위로 읽기 (회전 + RGB 변환 포함)
+def read_frame_batches(cap, batch_size):
+    batch = []
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             break
+        batch.append(prepare_frame(frame))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
 
-        frame = rotate_frame_if_needed(frame)
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame_tensor = tf.convert_to_tensor(frame_rgb)
+# 파이프라인 decode 단계: 회전 + RGB 변환
+def prepare_frame(frame):
+    frame = rotate_frame_if_needed(frame)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
+# 파이프라인 infer 단계: 배치 추론, 실패 시 프레임 단위로 재시도하여 실패 프레임만 제외
+# tracker가 있으면 ROI crop으로 추론 (프레임 단위 재시도는 전체 프레임)
+# 재시도한 경우 (keypoints, 성공한 배치 내 위치)를 반환 → PosePipeline.frame_indices에 반영
+def infer_pose_batch(frames, variant="thunder", tracker=None):
+    try:
+        if tracker is not None:
+            return detect_pose_batch_roi(frames, tracker, variant)
+        return detect_pose_batch(frames, variant)
+    except Exception as e:
+        print(f"배치 추출 오류 ({len(frames)}프레임): {e}")
+
+    keypoints, kept = [], []
+    for k, frame in enumerate(frames):
         try:
-            keypoints = detect_pose(frame_tensor)
-            normalized = normalize_keypoints(keypoints)
-            raw_keypoints.append(keypoints)
-            norm_keypoints.append(normalized)
+            keypoints.append(detect_pose(frame, variant))
+            kept.append(k)
         except Exception as e:
-            print(f"키포인트 추출 오류 (프레임 {frame_count}): {e}")
+            print(f"키포인트 추출 오류 (배치 내 프레임 {k}): {e}")
+    return np.array(keypoints).reshape(-1, 17, 3), kept
+
+# 스윙/릴리스 구간 검출: 손목 이동 속도가 최대값의 speed_ratio 이상인 연속 구간 + 앞뒤 margin
+def detect_swing_window(norm_keypoints, speed_ratio=None, margin=None, smooth=5):
+    """
+    입력: 정규화 keypoints (N, 17, 3)
+    반환: (first, last) 포함 구간 인덱스
+    """
+    speed_ratio = config.ADAPTIVE_SPEED_RATIO if speed_ratio is None else speed_ratio
+    margin = config.ADAPTIVE_MARGIN if margin is None else margin
+    n = len(norm_keypoints)
+    if n < 2:
+        return 0, n - 1
 
-        frame_count += 1
-        if frame_count % 10 == 0:
-            print(f"{frame_count}프레임 처리 중...")
+    wrists = np.asarray(norm_keypoints)[:, [9, 10], :2]
+    speed = np.linalg.norm(np.diff(wrists, axis=0), axis=2).max(axis=1)  # (N-1,) i → i+1 이동량
+    speed = np.convolve(speed, np.ones(smooth) / smooth, mode="same")
 
-    cap.release()
+    peak = int(np.argmax(speed))
+    active = speed >= speed[peak] * speed_ratio
+    first, last = peak, peak
+    while first > 0 and active[first - 1]:
+        first -= 1
+    while last < len(speed) - 1 and active[last + 1]:
+        last += 1
+    return max(first - margin, 0), min(last + 1 + margin, n - 1)
+
+
+# 추론 간격: fps / target_fps 반올림 (target_fps가 없거나 fps를 모르면 1 = 모든 프레임)
+def sampling_stride(fps, target_fps=None):
+    target_fps = config.POSE_TARGET_FPS if target_fps is None else target_fps
+    if not target_fps or not fps or fps <= 0:
+        return 1
+    return max(int(round(fps / target_fps)), 1)
+
+
+# 샘플링한 keypoints를 원하는 프레임 위치로 보간 (confidence 반영)
+def interpolate_keypoints(keypoints, indices, positions, min_confidence=None):
+    """
+    keypoints: 추론한 프레임의 keypoints (M, 17, 3), indices: 그 프레임 위치 (M,)
+    positions: 출력 프레임 위치 (L,) — 정수(누락 프레임 채우기) 또는 실수(길이 리샘플)
+    - 좌표(y, x): confidence가 min_confidence 이상인 샘플만 기준점으로 선형 보간
+                  (신뢰도 낮은 샘플도 주변의 신뢰도 높은 값으로 대체, 기준점이 없는 관절은 전체 샘플 사용)
+    - confidence: 모든 샘플로 선형 보간 (신뢰도 낮은 구간은 낮게 유지)
+    반환: (L, 17, 3)
+    """
+    min_confidence = config.POSE_MIN_CONFIDENCE if min_confidence is None else min_confidence
+    keypoints = np.asarray(keypoints, dtype=np.float32)
+    indices = np.asarray(indices, dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.float64)
+
+    out = np.empty((len(positions), 17, 3), dtype=np.float32)
+    confident = keypoints[:, :, 2] >= min_confidence
+    for j in range(17):
+        anchors = confident[:, j] if confident[:, j].any() else np.ones(len(indices), dtype=bool)
+        for c in range(2):
+            out[:, j, c] = np.interp(positions, indices[anchors], keypoints[anchors, j, c])
+        out[:, j, 2] = np.interp(positions, indices, keypoints[:, j, 2])
+    return out
+
+
+def _extract_with_variant(video_path, variant, batch_size, start_frame, end_frame, target_fps=None):
+    """반환: (raw, norm, 각 keypoints 프레임의 구간 내 위치) — 추론에 실패한 프레임은 빠져 있을 수 있음"""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"영상 열기 실패: {video_path}")
+        return None, None, None
+    tracker = RoiTracker() if config.POSE_ROI else None
+    try:
+        stride = sampling_stride(cap.get(cv2.CAP_PROP_FPS), target_fps)
+        pipeline = PosePipeline(
+            infer_fn=functools.partial(infer_pose_batch, variant=variant, tracker=tracker),
+            # 샘플링 시에는 전체 프레임으로 보간한 뒤 한 번에 정규화
+            post_fn=normalize_keypoints_batch if stride == 1 else None,
+            frame_fn=prepare_frame,
+            batch_size=batch_size or config.POSE_BATCH_SIZE,
+            queue_size=config.POSE_QUEUE_SIZE,
+            name=f"movenet-{variant}"
+        )
+        raw_keypoints, norm_keypoints = pipeline.run(cap, start_frame, end_frame, stride)
+    finally:
+        cap.release()
+
+    if tracker is not None:
+        print(f"[ROI] crop 추론 {tracker.cropped_frames}프레임 | 전체 프레임 재추론 {tracker.fallback_frames}프레임")
+    if stride == 1 or raw_keypoints is None:
+        return raw_keypoints, norm_keypoints, np.asarray(pipeline.frame_indices, dtype=int)
+
+    # 추론에 성공한 프레임 위치만 기준점으로 보간 (실패한 샘플 프레임도 함께 채워짐)
+    total = pipeline.stats["frames_total"]
+    raw_keypoints = interpolate_keypoints(raw_keypoints, pipeline.frame_indices, np.arange(total))
+    print(f"[SAMPLE] stride={stride}: {len(pipeline.frame_indices)}/{total}프레임 추론 후 보간")
+    return raw_keypoints, normalize_keypoints_batch(raw_keypoints), np.arange(total)
+
+
+# adaptive: 전체 프레임 Lightning → 스윙/릴리스 구간만 Thunder로 다시 추론해 교체
+def _extract_adaptive(video_path, batch_size, start_frame, end_frame, target_fps=None):
+    raw_keypoints, norm_keypoints, positions = _extract_with_variant(
+        video_path, "lightning", batch_size, start_frame, end_frame, target_fps
+    )
+    if norm_keypoints is None or len(norm_keypoints) == 0:
+        return raw_keypoints, norm_keypoints
+
+    # 스윙 구간은 keypoints 배열 위치 → 디코딩 실패로 빠진 프레임이 있을 수 있으므로 구간 내 프레임 위치로 변환
+    first, last = detect_swing_window(norm_keypoints)
+    offset = max(start_frame, 0)
+    thunder_raw, thunder_norm, thunder_positions = _extract_with_variant(
+        video_path, "thunder", batch_size, offset + positions[first], offset + positions[last], target_fps
+    )
+    if thunder_norm is not None and len(thunder_norm):
+        # 두 추론 모두 성공한 프레임만 같은 위치끼리 교체
+        source = positions[first] + thunder_positions
+        index = np.searchsorted(positions, source)
+        matched = index < len(positions)
+        matched[matched] = positions[index[matched]] == source[matched]
+        raw_keypoints[index[matched]] = thunder_raw[matched]
+        norm_keypoints[index[matched]] = thunder_norm[matched]
+        print(f"[ADAPTIVE] Thunder 구간 {positions[first]}~{positions[last]} "
+              f"({int(matched.sum())}/{len(norm_keypoints)}프레임)")
+    return raw_keypoints, norm_keypoints
+
+
+#keyPoint 관절 추출
+# start_frame~end_frame(포함) 구간만 추론, end_frame=-1이면 영상 끝까지
+# mode: "thunder" / "lightning" / "adaptive" (기본 config.POSE_MODE), 출력 형식은 모두 같음
+# target_fps: 이 fps에 가깝게 N프레임마다 추론하고 나머지는 보간 (기본 config.POSE_TARGET_FPS, 0이면 모든 프레임)
+def extract_keypoints_from_video(video_path, output_folder, batch_size=None, start_frame=0, end_frame=-1, mode=None,
+                                 target_fps=None):
+    mode = mode or config.POSE_MODE
+    if mode == "adaptive":
+        raw_keypoints, norm_keypoints = _extract_adaptive(video_path, batch_size, start_frame, end_frame, target_fps)
+    else:
+        raw_keypoints, norm_keypoints, _ = _extract_with_variant(
+            video_path, mode, batch_size, start_frame, end_frame, target_fps
+        )
 
-    if len(norm_keypoints) == 0:
+    if norm_keypoints is None or len(norm_keypoints) == 0:
         print(f"{video_path} 처리 실패: 키포인트 없음")
         return None, None
 
-    print(f"추출 완료: 총 {len(norm_keypoints)}프레임")
-    return np.array(raw_keypoints), np.array(norm_keypoints)
+    print(f"추출 완료: 총 {len(norm_keypoints)}프레임 (mode={mode})")
+    return raw_keypoints, norm_keypoints
@@ -0,0 +1,223 @@
+# pose_pipeline.py
+# 디코딩 → 포즈 추론 → 후처리를 bounded queue로 연결한 스트리밍 파이프라인
+import time
+import threading
+import queue
+import numpy as np
+import cv2
+
+# 스레드 간 종료 신호
+_END = object()
+
+
+class _StageError:
+    def __init__(self, error):
+        self.error = error
+
+
+# start_frame 위치로 이동 (seek가 부정확한 코덱이면 디코딩만 하고 건너뜀)
+def seek_to_frame(cap, start_frame):
+    if start_frame <= 0:
+        return
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == start_frame:
+        return
+    print(f"[SEEK] CAP_PROP_POS_FRAMES 실패 → {start_frame}프레임까지 grab으로 건너뜀")
+    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+    for _ in range(start_frame):
+        if not cap.grab():
+            break
+
+
+# 처리할 프레임 수 계산 ([start_frame, end_frame] 포함 구간, end_frame=-1이면 끝까지)
+def frame_range_length(start_frame, end_frame):
+    if end_frame is None or end_frame < 0:
+        return None
+    return max(end_frame - max(start_frame, 0) + 1, 0)
+
+
+class PosePipeline:
+    """
+    영상 한 개를 스트리밍으로 처리하는 3단계 파이프라인입니다.
+
+    - decode 스레드: cap.read() + frame_fn, batch_size 단위로 묶음
+    - infer 단계(호출 스레드): infer_fn(frames) → (N, 17, 3)
+      일부 프레임만 성공한 경우 (keypoints (M, 17, 3), 성공한 배치 내 위치 (M,))를 반환
+    - post 스레드: post_fn(keypoints) → (N, 17, 3)
+
+    단계 사이 queue 크기가 queue_size로 제한되므로 메모리는 영상 길이와 무관하게
+    batch_size * queue_size 프레임 수준으로 유지됩니다.
+    """
+
+    def __init__(self, infer_fn, post_fn=None, frame_fn=None, batch_size=32, queue_size=4, name="pose"):
+        self.infer_fn = infer_fn
+        self.post_fn = post_fn
+        self.frame_fn = frame_fn
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.name = name
+        self.stats = {}
+
+    # 단계별 소요 시간 누적
+    def _add_time(self, stage, seconds):
+        self.stats[stage] = self.stats.get(stage, 0.0) + seconds
+
+    # 중단 신호를 확인하면서 queue에 넣기 (소비자가 멈춰도 생산자가 영원히 막히지 않도록)
+    def _put(self, q, item, stop):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_worker(self, cap, out_q, stop, max_frames, stride):
+        try:
+            batch, indices = [], []
+            decoded = 0
+            while not stop.is_set():
+                if max_frames is not None and decoded >= max_frames:
+                    break
+                start = time.perf_counter()
+                # stride 샘플링: 건너뛰는 프레임은 grab만 (디코딩된 이미지를 꺼내지 않음)
+                if decoded % stride:
+                    ret = cap.grab()
+                    self._add_time("decode", time.perf_counter() - start)
+                    if not ret:
+                        break
+                    decoded += 1
+                    continue
+                ret, frame = cap.read()
+                if ret and self.frame_fn is not None:
+                    frame = self.frame_fn(frame)
+                self._add_time("decode", time.perf_counter() - start)
+                if not ret:
+                    break
+                indices.append(decoded)
+                decoded += 1
+                batch.append(frame)
+                if len(batch) == self.batch_size:
+                    if not self._put(out_q, (indices, batch), stop):
+                        return
+                    batch, indices = [], []
+            if batch:
+                self._put(out_q, (indices, batch), stop)
+            self.stats["frames_total"] = decoded
+        except Exception as e:
+            self._put(out_q, _StageError(e), stop)
+        finally:
+            self._put(out_q, _END, stop)
+
+    def _post_worker(self, in_q, results, stop):
+        try:
+            while not stop.is_set():
+                try:
+                    item = in_q.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _END:
+                    break
+                start = time.perf_counter()
+                processed = self.post_fn(item) if self.post_fn is not None else item
+                self._add_time("post", time.perf_counter() - start)
+                results.append((item, processed))
+        except Exception as e:
+            results.append(_StageError(e))
+            stop.set()
+
+    def run(self, cap, start_frame=0, end_frame=-1, stride=1):
+        """
+        열린 cv2.VideoCapture의 [start_frame, end_frame] 구간만 처리합니다. (end_frame=-1이면 끝까지)
+        구간 밖의 프레임은 추론하지 않습니다.
+        stride > 1이면 구간 내 stride 프레임마다 1개만 추론합니다.
+          self.frame_indices: 추론에 성공한 프레임의 구간 내 위치 (반환 keypoints와 같은 순서)
+          self.stats["frames_total"]: 구간 전체 프레임 수
+        반환: (raw_keypoints, processed_keypoints) — 키포인트가 없으면 (None, None)
+        """
+        self.stats = {"decode": 0.0, "infer": 0.0, "post": 0.0, "frames": 0, "frames_total": 0}
+        self.frame_indices = []
+        stride = max(int(stride), 1)
+        decode_q = queue.Queue(maxsize=self.queue_size)
+        post_q = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        results = []
+
+        seek_to_frame(cap, start_frame)
+        max_frames = frame_range_length(start_frame, end_frame)
+        decoder = threading.Thread(target=self._decode_worker, args=(cap, decode_q, stop, max_frames, stride), daemon=True)
+        poster = threading.Thread(target=self._post_worker, args=(post_q, results, stop), daemon=True)
+        decoder.start()
+        poster.start()
+
+        wall_start = time.perf_counter()
+        error = None
+        try:
+            while True:
+                try:
+                    item = decode_q.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        break
+                    continue
+                if item is _END:
+                    break
+                if isinstance(item, _StageError):
+                    error = item.error
+                    break
+                indices, frames = item
+                start = time.perf_counter()
+                keypoints = self.infer_fn(frames)
+                self._add_time("infer", time.perf_counter() - start)
+                if isinstance(keypoints, tuple):
+                    keypoints, kept = keypoints
+                    indices = [indices[k] for k in kept]
+                self.frame_indices.extend(indices)
+                self.stats["frames"] += len(frames)
+                if len(keypoints) and not self._put(post_q, keypoints, stop):
+                    break
+        except Exception as e:
+            error = e
+        finally:
+            if error is not None:
+                stop.set()
+            self._put(post_q, _END, stop)
+            decoder.join()
+            poster.join()
+        self.stats["wall"] = time.perf_counter() - wall_start
+
+        for r in results:
+            if isinstance(r, _StageError):
+                error = error or r.error
+        if error is not None:
+            raise error
+
+        self.report()
+        if not results:
+            return None, None
+        raw = np.concatenate([r[0] for r in results], axis=0)
+        processed = np.concatenate([r[1] for r in results], axis=0)
+        return raw, processed
+
+    def report(self):
+        s = self.stats
+        wall = s.get("wall", 0.0) or 1e-9
+        sampled = f" (전체 {s['frames_total']}프레임 중)" if s["frames_total"] != s["frames"] else ""
+        print(
+            f"[{self.name}] {s['frames']}프레임{sampled} | wall={wall:.2f}s ({s['frames'] / wall:.1f} fps) | "
+            f"decode={s['decode']:.2f}s infer={s['infer']:.2f}s post={s['post']:.2f}s"
+        )
+
+
+# 파일 경로로 실행하는 편의 함수
+def run_pose_pipeline(video_path, infer_fn, post_fn=None, frame_fn=None, batch_size=32, queue_size=4, name="pose",
+                      start_frame=0, end_frame=-1, stride=1):
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        print(f"영상 열기 실패: {video_path}")
+        return None, None
+    try:
+        pipeline = PosePipeline(infer_fn, post_fn, frame_fn, batch_size, queue_size, name)
+        return pipeline.run(cap, start_frame, end_frame, stride)
+    finally:
+        cap.release()
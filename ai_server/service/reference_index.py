@@ -0,0 +1,143 @@
+# reference_index.py
+# 기준 자세 라이브러리에서 K개 최근접 기준 시퀀스를 찾는 인덱스
+#   1) 고정 길이 리샘플 + PCA 임베딩 거리로 후보 축소
+#   2) LB_Keogh 하한으로 정렬/가지치기하며 리샘플 시퀀스 DTW
+#   3) 상위 K개만 원본 해상도 DTW
+import time
+import hashlib
+import threading
+import numpy as np
+import config
+from service.dtw_engine import dtw
+from service.reference_store import reference_store
+
+
+def resample_sequence(seq, length):
+    """(T, D) 시퀀스를 선형 보간으로 (length, D)로 리샘플"""
+    seq = np.asarray(seq, dtype=np.float32)
+    if len(seq) == 1:
+        return np.repeat(seq, length, axis=0)
+    pos = np.linspace(0, len(seq) - 1, length)
+    i0 = np.floor(pos).astype(int)
+    i1 = np.minimum(i0 + 1, len(seq) - 1)
+    frac = (pos - i0)[:, None].astype(np.float32)
+    return seq[i0] * (1 - frac) + seq[i1] * frac
+
+
+def keogh_envelope(seq, radius):
+    """(L, D) 시퀀스의 ±radius 구간 상한/하한 envelope"""
+    padded = np.pad(seq, ((radius, radius), (0, 0)), mode="edge")
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * radius + 1, axis=0)
+    return windows.max(axis=2), windows.min(axis=2)
+
+
+def lb_keogh(candidates, upper, lower):
+    """
+    candidates: (N, L, D), upper/lower: (L, D)
+    프레임별 envelope 박스까지의 유클리드 거리 합 → band DTW 거리의 하한 (N,)
+    """
+    excess = np.maximum(candidates - upper, 0) + np.maximum(lower - candidates, 0)
+    return np.linalg.norm(excess, axis=2).sum(axis=1)
+
+
+class PitchIndex:
+    """구질 1개의 기준 시퀀스 인덱스"""
+
+    def __init__(self, entries, length=64, n_components=32, radius=6):
+        self.entries = entries
+        self.length = length
+        self.radius = radius
+        self.resampled = np.stack([resample_sequence(e.flat, length) for e in entries])
+
+        # PCA (SVD) 임베딩
+        flat = self.resampled.reshape(len(entries), -1)
+        self.mean = flat.mean(axis=0)
+        n_components = min(n_components, len(entries))
+        _, _, vt = np.linalg.svd(flat - self.mean, full_matrices=False)
+        self.components = vt[:n_components]
+        self.embeddings = (flat - self.mean) @ self.components.T
+
+    def embed(self, resampled):
+        return (resampled.reshape(-1) - self.mean) @ self.components.T
+
+    def query(self, test_flat, k=3, shortlist=32):
+        """
+        test_flat: (T, 34) 비교 대상
+        반환: 원본 DTW 거리 오름차순 match 리스트
+              [{"entry", "distance", "path"}, ...] (최대 k개)
+        """
+        k = min(k, len(self.entries))
+        query = resample_sequence(test_flat, self.length)
+
+        # 1) 임베딩 거리로 후보 축소
+        emb_dist = np.linalg.norm(self.embeddings - self.embed(query), axis=1)
+        candidates = np.argsort(emb_dist)[:max(shortlist, k)]
+
+        # 2) LB_Keogh 오름차순으로 리샘플 DTW, 하한이 현재 k번째 거리 이상이면 중단
+        upper, lower = keogh_envelope(query, self.radius)
+        bounds = lb_keogh(self.resampled[candidates], upper, lower)
+        coarse = []
+        for idx in np.argsort(bounds):
+            if len(coarse) >= k and bounds[idx] >= coarse[k - 1][0]:
+                break
+            ref_idx = candidates[idx]
+            distance, _ = dtw(self.resampled[ref_idx], query, window=self.radius)
+            coarse.append((distance, ref_idx))
+            coarse.sort()
+
+        # 3) 상위 k개만 원본 해상도 DTW
+        matches = []
+        for _, ref_idx in coarse[:k]:
+            entry = self.entries[ref_idx]
+            distance, path = dtw(entry.flat, test_flat, window=config.DTW_WINDOW)
+            matches.append({"entry": entry, "distance": distance, "path": path})
+        matches.sort(key=lambda m: m["distance"])
+        return matches
+
+
+class ReferenceIndex:
+    """
+    구질별 PitchIndex 캐시. 기준 파일 목록 또는 mtime이 바뀌면 다시 만듭니다.
+    요청마다 폴더 mtime만 확인하고, 폴더가 바뀌었거나 REFERENCE_RESCAN_SECONDS가 지났을 때만
+    파일 목록/mtime 전체를 다시 확인합니다.
+    """
+
+    def __init__(self, store, rescan_seconds=None):
+        self.store = store
+        self.rescan_seconds = config.REFERENCE_RESCAN_SECONDS if rescan_seconds is None else rescan_seconds
+        self._indexes = {}
+        self._checked = {}  # 구질 → (폴더 mtime, 마지막 전체 확인 시각)
+        self._lock = threading.Lock()
+
+    def get(self, pitch_type):
+        cached = self._indexes.get(pitch_type)
+        folder_mtime = self.store.folder_mtime(pitch_type)
+        checked = self._checked.get(pitch_type)
+        if (cached is not None and checked is not None and checked[0] == folder_mtime
+                and time.time() - checked[1] < self.rescan_seconds):
+            return cached[1]
+
+        entries = self.store.references(pitch_type)
+        if not entries:
+            raise FileNotFoundError(f"기준 자세가 없습니다: {pitch_type}")
+        signature = tuple((e.path, e.mtime) for e in entries)
+        self._checked[pitch_type] = (folder_mtime, time.time())
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with self._lock:
+            index = PitchIndex(entries)
+            self._indexes[pitch_type] = (signature, index)
+            print(f"[INDEX] {pitch_type}: {len(entries)}개 기준 시퀀스 인덱스 생성")
+        return index
+
+    # 기준 라이브러리 버전 (파일 목록/mtime 해시, 캐시 키용)
+    def version(self, pitch_type):
+        self.get(pitch_type)
+        return hashlib.sha1(repr(self._indexes[pitch_type][0]).encode()).hexdigest()[:12]
+
+    def nearest(self, pitch_type, test_flat, k=3):
+        return self.get(pitch_type).query(test_flat, k=k, shortlist=config.REFERENCE_SHORTLIST)
+
+
+# 프로세스 전역 인덱스
+reference_index = ReferenceIndex(reference_store)
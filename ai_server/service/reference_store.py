@@ -0,0 +1,90 @@
+# reference_store.py
+# 기준 자세(.npy)를 시작 시 한 번 로드해 (T, 34) float32 형태로 보관하는 캐시
+import os
+import threading
+import numpy as np
+
+REFERENCE_DIR = os.path.join("data", "keypoints_norm")
+PITCH_TYPES = ["twohand", "cranker", "stroker", "thumbless"]
+
+
+class ReferenceEntry:
+    """
+    기준 시퀀스 1개와 파생 데이터
+    - keypoints: (T, 17, 3) 원본
+    - flat: (T, 34) float32 contiguous (x, y만 flatten)
+    """
+
+    def __init__(self, path, mtime, keypoints):
+        self.path = path
+        self.mtime = mtime
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.keypoints = keypoints
+        self.flat = np.ascontiguousarray(keypoints[:, :, :2].reshape(len(keypoints), -1), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.flat)
+
+
+def load_reference(path):
+    keypoints = np.load(path).astype(np.float32)
+    if keypoints.ndim != 3:
+        raise ValueError(f"잘못된 keypoints 형태입니다: {path} {keypoints.shape}")
+    return ReferenceEntry(path, os.path.getmtime(path), keypoints)
+
+
+class ReferenceStore:
+    """
+    경로별 ReferenceEntry 캐시. 조회 시 .npy mtime이 바뀌었으면 다시 로드합니다.
+    """
+
+    def __init__(self, root=REFERENCE_DIR):
+        self.root = root
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        path = os.path.normpath(path)
+        mtime = os.path.getmtime(path)
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime == mtime:
+            return entry
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.mtime != mtime:
+                entry = load_reference(path)
+                self._entries[path] = entry
+        return entry
+
+    def reference_paths(self, pitch_type):
+        folder = os.path.join(self.root, pitch_type)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(
+            os.path.normpath(os.path.join(folder, f))
+            for f in os.listdir(folder) if f.endswith(".npy")
+        )
+
+    # 구질 폴더 mtime (파일 추가/삭제/이름 변경 시 바뀜), 폴더가 없으면 None
+    def folder_mtime(self, pitch_type):
+        folder = os.path.join(self.root, pitch_type)
+        return os.path.getmtime(folder) if os.path.isdir(folder) else None
+
+    # 구질별 전체 기준 시퀀스 (삭제된 파일은 캐시에서도 제거)
+    def references(self, pitch_type):
+        paths = self.reference_paths(pitch_type)
+        folder = os.path.normpath(os.path.join(self.root, pitch_type))
+        with self._lock:
+            for stale in [p for p in self._entries if os.path.dirname(p) == folder and p not in paths]:
+                del self._entries[stale]
+        return [self.get(p) for p in paths]
+
+    def load_all(self, pitch_types=PITCH_TYPES):
+        for pitch_type in pitch_types:
+            entries = self.references(pitch_type)
+            total = sum(len(e) for e in entries)
+            print(f"[REF] {pitch_type}: {len(entries)}개 기준 시퀀스 로드 ({total}프레임)")
+
+
+# 프로세스 전역 기준 자세 저장소
+reference_store = ReferenceStore()
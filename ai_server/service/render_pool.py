@@ -0,0 +1,104 @@
+# render_pool.py
+# 요청 간 공유하는 비교 영상 렌더 프로세스 풀
+import os
+import time
+import atexit
+import threading
+import multiprocessing
+import config
+from service.render_worker import render_batch
+
+
+class _ChunkResult:
+    def __init__(self, async_result):
+        self._async = async_result
+
+    def get(self):
+        return [canvas for canvases, _ in self._async.get() for canvas in canvases]
+
+
+class RenderPool:
+    """
+    서버 시작 시 한 번 만들어 모든 요청이 공유하는 렌더 풀
+
+    - spawn으로 worker를 띄워 TensorFlow가 로드된 부모 메모리를 상속하지 않음
+      (worker는 render_worker 모듈만 사용)
+    - submit(chunk): 프레임 청크를 worker 수만큼 나눠 병렬 렌더링
+    - metrics(): 대기 중인 청크/프레임 수, 사용률
+    """
+
+    def __init__(self, processes, start_method="spawn"):
+        self.processes = max(min(processes, os.cpu_count() or 1), 1)
+        self.start_method = start_method
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending_chunks = 0
+        self._pending_frames = 0
+        self._completed_frames = 0
+        self._busy_seconds = 0.0
+        self._started_at = None
+
+    def start(self):
+        # spawn worker가 진입 모듈(app.py)을 다시 import하는 중에 호출되면 풀을 만들지 않음
+        # (bootstrap 중 Pool 생성은 RuntimeError → 부모 Pool이 worker를 끝없이 다시 띄움)
+        if multiprocessing.current_process().name != "MainProcess":
+            return
+        with self._lock:
+            if self._pool is not None:
+                return
+            start = time.perf_counter()
+            ctx = multiprocessing.get_context(self.start_method)
+            self._pool = ctx.Pool(processes=self.processes)
+            self._started_at = time.time()
+        print(f"[RENDER] 렌더 풀 시작: {self.processes}개 프로세스 ({time.perf_counter() - start:.2f}s)")
+
+    def submit(self, chunk):
+        self.start()
+        if self._pool is None:
+            raise RuntimeError("렌더 풀은 서버 메인 프로세스에서만 사용할 수 있습니다")
+        size = max(1, -(-len(chunk) // self.processes))
+        parts = [chunk[i:i + size] for i in range(0, len(chunk), size)]
+        frames = len(chunk)
+
+        with self._lock:
+            self._pending_chunks += 1
+            self._pending_frames += frames
+
+        def on_done(results):
+            with self._lock:
+                self._pending_chunks -= 1
+                self._pending_frames -= frames
+                self._completed_frames += frames
+                self._busy_seconds += sum(elapsed for _, elapsed in results)
+
+        def on_error(_):
+            with self._lock:
+                self._pending_chunks -= 1
+                self._pending_frames -= frames
+
+        return _ChunkResult(self._pool.map_async(render_batch, parts, callback=on_done, error_callback=on_error))
+
+    def metrics(self):
+        with self._lock:
+            uptime = time.time() - self._started_at if self._started_at else 0.0
+            utilization = self._busy_seconds / (uptime * self.processes) if uptime > 0 else 0.0
+            return {
+                "processes": self.processes,
+                "started": self._pool is not None,
+                "pending_chunks": self._pending_chunks,
+                "pending_frames": self._pending_frames,
+                "completed_frames": self._completed_frames,
+                "utilization": round(min(utilization, 1.0), 4),
+            }
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+
+# 프로세스 전역 렌더 풀 (RENDER_PROCESSES=0이면 사용하지 않음)
+render_pool = RenderPool(config.RENDER_PROCESSES)
+atexit.register(render_pool.close)
@@ -0,0 +1,91 @@
+# render_service.py
+# 비교 영상 렌더링을 분석 응답과 분리해 백그라운드에서 실행
+import os
+import time
+import threading
+from glob import glob, escape
+import config
+from service.job_service import JobQueue, QueueFullError
+from service.visualize_service import visualize_pose_feedback
+
+# 비교 영상 렌더링 작업 큐
+render_jobs = JobQueue(
+    workers=config.RENDER_WORKERS,
+    max_pending=config.RENDER_MAX_PENDING,
+    ttl=config.JOB_RESULT_TTL,
+    name="render"
+)
+
+COMPARISON_DIR = os.path.join("output", "comparison")
+
+# 파일명 → (job_id, 저장 경로, 예약 시각), 렌더 작업과 같은 TTL이 지나면 정리 (이후에는 디스크에서 조회)
+_renders = {}
+_lock = threading.Lock()
+
+
+def _expired(job_id, created_at, now):
+    if now - created_at <= render_jobs.ttl:
+        return False
+    job = render_jobs.get(job_id) if job_id else None
+    return job is None or job["finished_at"] is not None
+
+
+def _cleanup():
+    now = time.time()
+    with _lock:
+        expired = [filename for filename, (job_id, _, created_at) in _renders.items()
+                   if _expired(job_id, created_at, now)]
+        for filename in expired:
+            del _renders[filename]
+
+
+def _render(progress=None, **kwargs):
+    visualize_pose_feedback(**kwargs)
+    return kwargs["save_path"]
+
+
+def schedule_render(save_path, **kwargs):
+    """
+    비교 영상 렌더링을 예약하고 상태("pending" 또는 "ready")를 반환합니다.
+    렌더 대기열이 가득 차면 호출한 스레드에서 바로 렌더링합니다.
+    """
+    filename = os.path.basename(save_path)
+    _cleanup()
+    try:
+        job_id = render_jobs.submit(_render, save_path=save_path, **kwargs)
+    except QueueFullError:
+        print(f"[RENDER] 대기열 초과 → 즉시 렌더링: {filename}")
+        _render(save_path=save_path, **kwargs)
+        job_id = None
+    with _lock:
+        _renders[filename] = (job_id, save_path, time.time())
+    return render_status(filename)
+
+
+# 저장된 비교 영상 경로 (예약 기록이 없으면 output/comparison/<uid>/ 아래에서 검색, 재시작 후에도 조회 가능)
+def render_path(filename):
+    with _lock:
+        entry = _renders.get(filename)
+    if entry:
+        return entry[1]
+    filename = os.path.basename(filename)
+    matches = glob(os.path.join(escape(COMPARISON_DIR), "*", escape(filename)))
+    matches.append(os.path.join(COMPARISON_DIR, filename))
+    return next((path for path in matches if os.path.exists(path)), None)
+
+
+def render_status(filename):
+    """
+    "pending" | "ready" | "failed", 예약된 적 없는 파일이면 None
+    """
+    with _lock:
+        entry = _renders.get(filename)
+    if entry is None:
+        return None
+    job_id, save_path, _ = entry
+    job = render_jobs.get(job_id) if job_id else None
+    if job is not None and job["status"] in ("queued", "running"):
+        return "pending"
+    if job is not None and job["status"] == "failed":
+        return "failed"
+    return "ready" if os.path.exists(save_path) else "failed"
@@ -0,0 +1,46 @@
+# render_worker.py
+# 렌더 풀 worker에서 실행되는 그리기 함수 (numpy/cv2만 사용, TensorFlow를 import하지 않음)
+import time
+import numpy as np
+import cv2
+
+
+#프레임 단위 시각화
+# abnormal: 관절쌍별 이상 여부 (joint_analytics에서 미리 계산한 값)
+def render_frame(args):
+    i, frame, raw_kp, abnormal, top_joints, pose_pairs, h, w, pad = args
+
+    # 캔버스 초기화
+    canvas = np.full((h + pad * 2, w, 3), 255, dtype=np.uint8)
+    canvas[pad:pad + h, 0:w] = frame
+
+    # 관절쌍 단위로 색상 계산
+    for (a, b), is_abnormal in zip(pose_pairs, abnormal):
+        x1, y1, c1 = raw_kp[a]
+        x2, y2, c2 = raw_kp[b]
+        if c1 < 0.3 or c2 < 0.3:
+            continue
+
+        color = (0, 0, 255) if is_abnormal else (0, 255, 0)
+        thickness = 4 if is_abnormal else 2
+
+        x1, y1 = int(x1 * w), int(y1 * h) + pad
+        x2, y2 = int(x2 * w), int(y2 * h) + pad
+        cv2.line(canvas, (x1, y1), (x2, y2), color, thickness)
+
+    # 상위 오차 관절 강조 표시 (빨강 점)
+    for j in top_joints:
+        if j < len(raw_kp):
+            x, y, c = raw_kp[j]
+            if c > 0.3:
+                px, py = int(x * w), int(y * h) + pad
+                cv2.circle(canvas, (px, py), 6, (0, 0, 255), -1)
+
+    return canvas
+
+
+#여러 프레임을 한 번에 렌더링하고 소요 시간을 함께 반환 (풀 사용률 계산용)
+def render_batch(batch):
+    start = time.perf_counter()
+    canvases = [render_frame(args) for args in batch]
+    return canvases, time.perf_counter() - start
@@ -0,0 +1,130 @@
+# result_cache.py
+# 업로드 영상 해시 기반 디스크 캐시 (키포인트 npz / 분석 결과 json), 용량 초과 시 LRU 삭제
+import os
+import io
+import json
+import uuid
+import hashlib
+import threading
+import numpy as np
+import config
+
+CHUNK_SIZE = 1 << 20
+
+
+def save_stream_with_hash(stream, directory, ext=""):
+    """
+    업로드 스트림을 디스크에 쓰면서 sha256을 함께 계산 (파일을 다시 읽지 않음).
+    파일명은 내용 해시 ({sha256}{ext}) → 같은 이름의 다른 업로드가 대기 중인 작업/렌더의 입력을 덮어쓰지 않음.
+    반환: (저장 경로, sha256)
+    """
+    hasher = hashlib.sha256()
+    # 동시에 올라오는 업로드끼리 임시 파일이 겹치지 않도록 고유 이름 사용
+    tmp_path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                f.write(chunk)
+        video_hash = hasher.hexdigest()
+        path = os.path.join(directory, f"{video_hash}{ext}")
+        # 같은 내용이면 교체해도 읽는 쪽이 보는 데이터는 동일
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path, video_hash
+
+
+def make_key(*parts):
+    return hashlib.sha256("|".join(str(p) for p in parts).encode()).hexdigest()
+
+
+class DiskLRUCache:
+    """
+    root 아래 파일 단위 캐시. 조회 시 mtime을 갱신하고,
+    전체 크기가 max_bytes를 넘으면 mtime이 오래된 파일부터 삭제합니다.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def _path(self, kind, key, ext):
+        return os.path.join(self.root, kind, f"{key}.{ext}")
+
+    def _read(self, path, loader):
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                value = loader(f)
+            os.utime(path)  # LRU: 최근 사용 시각 갱신
+            return value
+        except Exception as e:
+            print(f"[CACHE] 읽기 실패 → 삭제: {path} ({e})")
+            self._remove(path)
+            return None
+
+    def _write(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.part"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    # 키포인트 (raw, norm)
+    def get_keypoints(self, key):
+        def load(f):
+            with np.load(f) as data:
+                return data["raw"], data["norm"]
+        return self._read(self._path("keypoints", key, "npz"), load)
+
+    def put_keypoints(self, key, raw_keypoints, norm_keypoints):
+        buffer = io.BytesIO()
+        np.savez(buffer, raw=raw_keypoints, norm=norm_keypoints)
+        self._write(self._path("keypoints", key, "npz"), buffer.getvalue())
+
+    # 분석 결과 (JSON dict)
+    def get_result(self, key):
+        return self._read(self._path("results", key, "json"), lambda f: json.loads(f.read().decode("utf-8")))
+
+    def put_result(self, key, result):
+        self._write(self._path("results", key, "json"), json.dumps(result, ensure_ascii=False).encode("utf-8"))
+
+    def evict(self):
+        with self._lock:
+            files = []
+            for dirpath, _, filenames in os.walk(self.root):
+                for name in filenames:
+                    if name.endswith(".part"):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    try:
+                        st = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    files.append((st.st_mtime, st.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                print(f"[CACHE] LRU 삭제: {path}")
+
+
+# 프로세스 전역 분석 캐시
+result_cache = DiskLRUCache(config.CACHE_DIR, config.CACHE_MAX_BYTES)
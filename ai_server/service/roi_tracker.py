@@ -0,0 +1,98 @@
+# roi_tracker.py
+# 이전 프레임 keypoints로 선수 주변만 잘라 MoveNet에 넣는 ROI tracker (MoveNet 표준 crop 알고리즘)
+#
+# 좌표계: resize_with_pad가 만드는 정사각형(긴 변 기준, 짧은 변 양쪽 패딩) 안의 0~1 좌표
+#   → 전체 프레임 추론 결과와 같은 좌표계이므로 raw/정규화 keypoints 형식이 바뀌지 않음
+#   keypoints[:, 0] = y, keypoints[:, 1] = x, keypoints[:, 2] = confidence (MoveNet 출력 순서)
+import numpy as np
+import config
+
+# 어깨(5, 6), 엉덩이(11, 12)
+TORSO_JOINTS = [5, 6, 11, 12]
+HIP_JOINTS = [11, 12]
+# 손목(9, 10), 발목(15, 16): crop 밖으로 나가면 가장자리에 붙은 좌표로 나옴
+LIMB_JOINTS = [9, 10, 15, 16]
+# crop 가장자리로 보는 범위 (crop 기준 0~1 좌표)
+EDGE_MARGIN = 0.02
+
+
+def torso_visible(keypoints, min_score):
+    """keypoints (..., 17, 3) → 엉덩이 중 하나 이상 + 어깨 중 하나 이상이 보이는지 (...,)"""
+    scores = np.asarray(keypoints)[..., 2]
+    hips = (scores[..., 11] > min_score) | (scores[..., 12] > min_score)
+    shoulders = (scores[..., 5] > min_score) | (scores[..., 6] > min_score)
+    return hips & shoulders
+
+
+def determine_crop_region(keypoints, min_score, scale=1.0):
+    """
+    한 프레임 keypoints (17, 3)로 다음 추론에 쓸 정사각형 crop [y_min, x_min, y_max, x_max]
+    몸통이 안 보이거나 crop이 전체 프레임보다 커지면 None (전체 프레임 사용)
+    """
+    keypoints = np.asarray(keypoints)
+    if not torso_visible(keypoints, min_score):
+        return None
+
+    center = keypoints[HIP_JOINTS, :2].mean(axis=0)
+    torso_range = np.abs(keypoints[TORSO_JOINTS, :2] - center).max(axis=0)
+    visible = keypoints[:, 2] > min_score
+    body_range = np.abs(keypoints[visible, :2] - center).max(axis=0)
+
+    half = max(torso_range.max() * 1.9, body_range.max() * 1.2) * scale
+    half = min(half, max(center[0], 1 - center[0], center[1], 1 - center[1]))
+    if half > 0.5:
+        return None
+    return np.array([center[0] - half, center[1] - half, center[0] + half, center[1] + half], dtype=np.float32)
+
+
+def crop_to_image_box(crop, h, w):
+    """정사각형 패딩 좌표 crop → tf.image.crop_and_resize용 원본 프레임 기준 box [y1, x1, y2, x2]"""
+    size = max(h, w)
+    pad_y, pad_x = (size - h) / 2, (size - w) / 2
+    y1, x1, y2, x2 = crop
+    return np.array([
+        (y1 * size - pad_y) / h, (x1 * size - pad_x) / w,
+        (y2 * size - pad_y) / h, (x2 * size - pad_x) / w,
+    ], dtype=np.float32)
+
+
+def crop_to_full(keypoints, crop):
+    """crop 안의 0~1 좌표 keypoints (N, 17, 3) → 정사각형 패딩 좌표"""
+    keypoints = np.array(keypoints, dtype=np.float32)
+    y1, x1, y2, x2 = crop
+    keypoints[..., 0] = y1 + keypoints[..., 0] * (y2 - y1)
+    keypoints[..., 1] = x1 + keypoints[..., 1] * (x2 - x1)
+    return keypoints
+
+
+class RoiTracker:
+    """
+    영상 1개 추론 동안 유지하는 crop 상태
+
+    - crop 추론은 config.ROI_SUB_BATCH 프레임 단위로 나눠, 단위마다 직전 프레임으로 crop 갱신
+      (scale로 단위 내 움직임 여유를 둠)
+    - crop이 None이면 전체 프레임 추론, 단위 마지막 프레임을 놓치면 None으로 돌아감
+    - crop에서 놓친 프레임은 배치 끝에서 전체 프레임 추론 한 번으로 모아서 다시 추론
+    """
+
+    def __init__(self, min_score=None, scale=None):
+        self.min_score = config.ROI_MIN_SCORE if min_score is None else min_score
+        self.scale = config.ROI_SCALE if scale is None else scale
+        self.crop = None
+        self.cropped_frames = 0
+        self.fallback_frames = 0
+
+    def update(self, keypoints):
+        """마지막 프레임 keypoints (17, 3)로 다음 배치 crop 갱신"""
+        self.crop = determine_crop_region(keypoints, self.min_score, self.scale)
+
+    def lost(self, crop_keypoints):
+        """
+        crop 기준 좌표의 추론 결과 (N, 17, 3) 중 다시 추론할 프레임 (N,)
+        몸통을 놓쳤거나, 손목/발목이 crop 가장자리에 붙은(잘린) 프레임
+        (신뢰도만 낮은 관절은 전체 프레임에서도 마찬가지이므로 재추론하지 않음)
+        """
+        crop_keypoints = np.asarray(crop_keypoints)
+        limbs = crop_keypoints[:, LIMB_JOINTS]
+        at_edge = ((limbs[..., :2] < EDGE_MARGIN) | (limbs[..., :2] > 1 - EDGE_MARGIN)).any(axis=-1)
+        return ~torso_visible(crop_keypoints, self.min_score) | at_edge.any(axis=1)
@@ -0,0 +1,67 @@
+# startup.py
+# 서버 초기화(warm-up) 단계 실행 및 상태 관리
+#   /healthz: 프로세스가 요청을 받을 수 있으면 200
+#   /readyz : warm-up 단계가 모두 끝나야 200 (그 전/실패 시 503)
+import time
+import threading
+import traceback
+
+
+class Startup:
+    """
+    (이름, 함수) 단계 목록을 순서대로 실행하고 단계별 소요 시간을 기록합니다.
+    state: idle → warming → ready / failed
+    """
+
+    def __init__(self):
+        self.state = "idle"
+        self.steps = {}  # 단계 이름 → 소요 시간(초)
+        self.error = None
+        self.started_at = time.time()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        self.steps[name] = round(seconds, 3)
+        print(f"[STARTUP] {name} ({seconds:.2f}s)")
+
+    def run(self, steps):
+        self.state = "warming"
+        start = time.perf_counter()
+        for name, fn in steps:
+            step_start = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                self.state, self.error = "failed", f"{name}: {e}"
+                print(f"[STARTUP] {name} 실패: {e}")
+                traceback.print_exc()
+                return
+            self.record(name, time.perf_counter() - step_start)
+        self.state = "ready"
+        print(f"[STARTUP] 준비 완료 ({time.perf_counter() - start:.2f}s)")
+
+    # background=True면 warm-up 중에도 서버가 요청을 받음 (/readyz는 503)
+    def start(self, steps, background=True):
+        with self._lock:
+            if self.state != "idle":
+                return
+            self.state = "warming"
+            if background:
+                self._thread = threading.Thread(target=self.run, args=(steps,), name="startup", daemon=True)
+                self._thread.start()
+                return
+        self.run(steps)
+
+    def status(self):
+        return {
+            "state": self.state,
+            "ready": self.state == "ready",
+            "steps": dict(self.steps),
+            "error": self.error,
+            "uptime": round(time.time() - self.started_at, 1),
+        }
+
+
+# 프로세스 전역 초기화 상태
+startup = Startup()
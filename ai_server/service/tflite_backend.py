@@ -0,0 +1,63 @@
+# tflite_backend.py
+# CPU 추론 노드용 TFLite 백엔드 (train/export_tflite.py로 변환한 .tflite 로드)
+import os
+import threading
+import numpy as np
+import config
+
+QUANTIZATIONS = ("none", "dynamic", "int8")
+
+
+def tflite_model_path(name, quantization=None):
+    """model/tflite/{name}[_{quantization}].tflite"""
+    quantization = quantization or config.TFLITE_QUANTIZATION
+    suffix = "" if quantization == "none" else f"_{quantization}"
+    return os.path.join(config.TFLITE_DIR, f"{name}{suffix}.tflite")
+
+
+class TFLitePredictor:
+    """
+    Interpreter 1개를 감싼 predict 함수 (입력 (N, ...) → 출력 (N, ...) numpy)
+
+    - 변환 시 배치 차원을 1로 고정하므로 샘플별로 invoke
+    - int8 입출력 모델은 scale/zero_point로 양자화/역양자화
+    - Interpreter는 스레드 안전하지 않으므로 lock으로 직렬화
+    """
+
+    def __init__(self, path, num_threads=None):
+        import tensorflow as tf
+        self.path = path
+        self.interpreter = tf.lite.Interpreter(model_path=path, num_threads=num_threads or None)
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self._lock = threading.Lock()
+
+    def _quantize(self, x):
+        scale, zero_point = self.input["quantization"]
+        if scale:
+            x = np.round(x / scale + zero_point)
+        return x.astype(self.input["dtype"])
+
+    def _dequantize(self, y):
+        scale, zero_point = self.output["quantization"]
+        if scale:
+            return (y.astype(np.float32) - zero_point) * scale
+        return y
+
+    def __call__(self, batch):
+        batch = np.asarray(batch)
+        outputs = []
+        with self._lock:
+            for sample in batch:
+                self.interpreter.set_tensor(self.input["index"], self._quantize(sample[None]))
+                self.interpreter.invoke()
+                outputs.append(self._dequantize(self.interpreter.get_tensor(self.output["index"])))
+        return np.concatenate(outputs, axis=0)
+
+
+# 로드 + 더미 입력으로 warm-up
+def load_tflite_predictor(path):
+    predictor = TFLitePredictor(path, config.TFLITE_THREADS)
+    predictor(np.zeros(predictor.input["shape"], dtype=np.float32))
+    return predictor
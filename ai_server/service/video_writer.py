@@ -0,0 +1,83 @@
+# video_writer.py
+# 렌더링된 BGR 프레임을 파이프로 ffmpeg(libx264)에 바로 넘겨 한 번에 인코딩
+import os
+import subprocess
+import tempfile
+import config
+
+
+class FFmpegWriter:
+    """
+    cv2.VideoWriter 대신 사용하는 libx264 단일 패스 writer
+
+    - preset/crf/threads: x264 인코딩 설정
+    - scale: 출력 해상도 배율 (미리보기용으로 0.5 등)
+    - 인코딩 중에는 *_part.mp4에 쓰고 close() 성공 시 save_path로 교체
+    """
+
+    def __init__(self, save_path, fps, size, preset=None, crf=None, threads=None, scale=1.0):
+        self.save_path = save_path
+        self.part_path = save_path.replace(".mp4", "_part.mp4")
+        self.size = size
+        width, height = size
+        preset = preset or config.FFMPEG_PRESET
+        crf = config.FFMPEG_CRF if crf is None else crf
+        threads = config.FFMPEG_THREADS if threads is None else threads
+
+        command = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'bgr24',
+            '-s', f'{width}x{height}', '-r', f'{fps or 30}',
+            '-i', '-',
+            '-vcodec', 'libx264',
+            '-preset', preset,
+            '-crf', str(crf),
+            '-threads', str(threads),
+            '-pix_fmt', 'yuv420p',
+            '-vf', f"scale='trunc(iw*{scale}/2)*2:trunc(ih*{scale}/2)*2'",
+            '-movflags', '+faststart',
+            self.part_path
+        ]
+        # stderr를 PIPE로 두면 버퍼가 차서 멈출 수 있으므로 임시 파일로 받음
+        self._stderr = tempfile.TemporaryFile()
+        self._proc = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=self._stderr)
+        self.frames = 0
+
+    def write(self, frame):
+        if (frame.shape[1], frame.shape[0]) != self.size:
+            raise ValueError(f"프레임 크기 불일치: {frame.shape[1]}x{frame.shape[0]} (기대 {self.size[0]}x{self.size[1]})")
+        self._proc.stdin.write(frame.tobytes())
+        self.frames += 1
+
+    def close(self):
+        """인코딩을 마치고 결과 파일을 확정합니다. 실패 시 RuntimeError"""
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        code = self._proc.wait()
+        self._stderr.seek(0)
+        message = self._stderr.read().decode(errors="ignore").strip()
+        self._stderr.close()
+        if code != 0:
+            if os.path.exists(self.part_path):
+                os.remove(self.part_path)
+            raise RuntimeError(f"ffmpeg 인코딩 실패 (code={code}): {message}")
+        os.replace(self.part_path, self.save_path)
+
+    def abort(self):
+        self._proc.kill()
+        self._proc.wait()
+        self._stderr.close()
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
@@ -1,9 +1,14 @@
-import numpy as np
 import cv2
-import subprocess
 import os
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-from multiprocessing import Pool, cpu_count
+from service.pose_pipeline import seek_to_frame
+from service.render_worker import render_frame
+from service.render_pool import render_pool
+from service.joint_analytics import (
+    POSE_PAIRS, joint_magnitudes, normalized_magnitudes, limb_abnormal_mask
+)
+from service.video_writer import FFmpegWriter
+import config
 
 JOINT_FEEDBACK_MAP = {
     0: "머리 위치가 흔들리고 있습니다.",
@@ -25,77 +30,20 @@ JOINT_FEEDBACK_MAP = {
     16: "오른발의 흔들림을 줄이세요."
 }
 
-#FFmpeg 변환 (코덱 호환성용)
-def convert_video_with_ffmpeg(input_path, output_path):
-    command = [
-        'ffmpeg', '-y',
-        '-i', input_path,
-        '-vcodec', 'libx264',
-        '-pix_fmt', 'yuv420p',
-        '-vf', "scale='trunc(iw/2)*2:trunc(ih/2)*2'",
-        output_path
-    ]
-    try:
-        subprocess.run(command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        print(f"ffmpeg 변환 완료: {output_path}")
-    except subprocess.CalledProcessError as e:
-        print(f"ffmpeg 변환 실패: {e}")
-
 #관절 회전 (아이폰 영상이 세로여서 필요)
 def rotate_keypoints_90ccw(keypoints):
     return [(y, x, c) for (x, y, c) in keypoints]
 
 
-#프레임 단위 시각화
-def render_frame(args):
-    i, frame, raw_kp, norm_kp, label, diff, top_joints, pose_pairs, h, w, pad = args
-
-    # 캔버스 초기화
-    canvas = np.full((h + pad * 2, w, 3), 255, dtype=np.uint8)
-    canvas[pad:pad + h, 0:w] = frame
-
-    # 현재 프레임 diff 계산
-    diff = diff.reshape(17, 2)
-    mags = np.linalg.norm(diff, axis=1)  # 각 관절별 차이 크기
-    max_mag = np.max(mags) if np.max(mags) > 0 else 1.0
-    norm_mags = mags / max_mag  # 0~1 정규화
-
-    # 임계값 설정 (차이 크기 0.15 이상이면 빨강)
-    threshold = 0.22
-
-    # 관절쌍 단위로 색상 계산
-    for a, b in pose_pairs:
-        x1, y1, c1 = raw_kp[a]
-        x2, y2, c2 = raw_kp[b]
-        if c1 < 0.3 or c2 < 0.3:
-            continue
-
-        # 두 관절 차이 평균으로 판단
-        joint_diff = (norm_mags[a] + norm_mags[b]) / 2.0
-        is_abnormal = joint_diff > threshold
-
-        color = (0, 0, 255) if is_abnormal else (0, 255, 0)
-        thickness = 4 if is_abnormal else 2
-
-        x1, y1 = int(x1 * w), int(y1 * h) + pad
-        x2, y2 = int(x2 * w), int(y2 * h) + pad
-        cv2.line(canvas, (x1, y1), (x2, y2), color, thickness)
-
-    # 상위 오차 관절 강조 표시 (빨강 점)
-    for j in top_joints:
-        if j < len(raw_kp):
-            x, y, c = raw_kp[j]
-            if c > 0.3:
-                px, py = int(x * w), int(y * h) + pad
-                cv2.circle(canvas, (px, py), 6, (0, 0, 255), -1)
-
-    return canvas
-
-
 #전체 시각화 실행 함수
-def visualize_pose_feedback(raw_keypoints, norm_keypoints, labels, diff_seq, top_joints, save_path, source_video):
+# fast=True: 미리보기용 (ultrafast preset + 해상도 축소)
+# abnormal: 관절쌍별 이상 여부 (T, len(POSE_PAIRS)), 없으면 diff_seq로 계산
+def visualize_pose_feedback(raw_keypoints, norm_keypoints, labels, diff_seq, top_joints, save_path, source_video,
+                            start_frame=0, fast=False, abnormal=None):
     cap = cv2.VideoCapture(source_video)
     fps = cap.get(cv2.CAP_PROP_FPS)
+    # keypoints 0번 = 원본 영상의 start_frame
+    seek_to_frame(cap, start_frame)
     ret, first_frame = cap.read()
     if not ret:
         print("첫 프레임 읽기 실패")
@@ -112,60 +60,74 @@ def visualize_pose_feedback(raw_keypoints, norm_keypoints, labels, diff_seq, top
     pad = 40
     output_size = (w, h + pad * 2)
 
-    temp_path = save_path.replace(".mp4", "_temp.mp4")
-    out = cv2.VideoWriter(temp_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, output_size)
+    # 렌더링된 프레임을 바로 ffmpeg(libx264)로 전달 (임시 mp4v 파일/재인코딩 없음)
+    if fast:
+        out = FFmpegWriter(save_path, fps, output_size, preset=config.PREVIEW_PRESET, scale=config.PREVIEW_SCALE)
+    else:
+        out = FFmpegWriter(save_path, fps, output_size)
 
-    # 관절 연결 정의
-    pose_pairs = [
-        (0, 1), (1, 3), (0, 2), (2, 4),
-        (5, 7), (7, 9), (6, 8), (8, 10),
-        (5, 6), (5, 11), (6, 12),
-        (11, 12), (11, 13), (13, 15),
-        (12, 14), (14, 16)
-    ]
+    # 관절쌍별 이상 여부는 전체 프레임을 한 번에 계산
+    if abnormal is None:
+        abnormal = limb_abnormal_mask(normalized_magnitudes(joint_magnitudes(diff_seq)))
 
     # 프레임 수 안전 보정
-    frames = []
-    for _ in range(min(len(norm_keypoints), len(labels))):
-        ret, frame = cap.read()
-        if not ret:
-            break
-        if rotated:
-            frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-        frames.append(frame)
-    cap.release()
-
-    safe_len = min(len(frames), len(raw_keypoints), len(norm_keypoints), len(labels), len(diff_seq))
-    args = [
-        (i, frames[i], rotate_keypoints_90ccw(raw_keypoints[i]), norm_keypoints[i],
-         labels[i], diff_seq[i], top_joints, pose_pairs, h, w, pad)
-        for i in range(safe_len)
-    ]
-
-    print(f"병렬 렌더링 시작 ({len(args)} frames)...")
-    with Pool(processes=min(cpu_count(), 4)) as pool:
-        results = pool.map(render_frame, args)
-
-    for canvas in results:
-        out.write(canvas)
-    out.release()
-
-    convert_video_with_ffmpeg(temp_path, save_path)
-    if os.path.exists(temp_path):
-        os.remove(temp_path)
-    print(f"시각화 완료: {save_path}")
-
-
-#이상 관절 정리 함수
-def summarize_top_joints(diff_seq, labels, top_k=4):
-    joint_error_sum = np.zeros(17)
-    safe_len = min(len(diff_seq), len(labels))
-
-    for i in range(safe_len):
-        if labels[i] == 1:
-            diffs = diff_seq[i].reshape(17, 2)
-            mags = np.linalg.norm(diffs, axis=1)
-            joint_error_sum += mags * (mags > 0.1)
-
-    sorted_idx = np.argsort(joint_error_sum)[::-1]
-    return [int(j) for j in sorted_idx[:top_k] if joint_error_sum[j] > 0]
\ No newline at end of file
+    safe_len = min(len(raw_keypoints), len(norm_keypoints), len(labels), len(diff_seq))
+
+    # 프레임을 읽는 즉시 렌더 인자로 변환 (전체 프레임을 메모리에 올리지 않음)
+    def frame_args():
+        frame = first_frame
+        for i in range(safe_len):
+            if i > 0:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if rotated:
+                    frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
+            yield (i, frame, rotate_keypoints_90ccw(raw_keypoints[i]), abnormal[i],
+                   top_joints, POSE_PAIRS, h, w, pad)
+
+    chunk_size = config.RENDER_CHUNK_SIZE
+    written = 0
+    print(f"스트리밍 렌더링 시작 ({safe_len} frames, chunk={chunk_size})...")
+    completed = False
+    try:
+        if config.RENDER_PROCESSES <= 0:
+            # 프로세스 없이 현재 프로세스에서 바로 그리고 쓰기
+            for a in frame_args():
+                out.write(render_frame(a))
+                written += 1
+        else:
+            # 청크 k+1을 읽는 동안 청크 k를 렌더링 → 메모리에는 최대 2개 청크만 유지
+            # (프로세스 풀은 요청마다 만들지 않고 서버 전역 render_pool을 공유)
+            pending = None
+            for chunk in _chunked(frame_args(), chunk_size):
+                result = render_pool.submit(chunk)
+                if pending is not None:
+                    for canvas in pending.get():
+                        out.write(canvas)
+                        written += 1
+                pending = result
+            if pending is not None:
+                for canvas in pending.get():
+                    out.write(canvas)
+                    written += 1
+        completed = True
+    finally:
+        cap.release()
+        if completed:
+            out.close()
+        else:
+            out.abort()
+    print(f"시각화 완료: {save_path} ({written} frames)")
+
+
+#iterable을 size개씩 묶기
+def _chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,143 @@
+# export_tflite.py
+# model/lstm_*.h5, model/movenet_{thunder,lightning} → model/tflite/*.tflite 변환 (CPU 추론 노드용)
+# 사용법: python train/export_tflite.py [none|dynamic|int8|all] [video_path ...]
+#   - dynamic: 가중치만 int8 (대표 데이터 불필요)
+#   - int8   : 활성값까지 int8, 대표 데이터로 보정
+#              LSTM은 data/lstm_dataset, MoveNet은 인자로 준 영상 프레임 사용 (영상이 없으면 MoveNet int8 생략)
+#   입출력은 float32/int32 그대로 두어 서비스 코드의 전처리를 바꾸지 않음
+import os
+import sys
+import multiprocessing
+from glob import glob
+import numpy as np
+import cv2
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+from tensorflow.keras.preprocessing.sequence import pad_sequences
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from service.lstm_service import EXPECTED_LEN, FEATURE_DIM
+from service.tflite_backend import QUANTIZATIONS, tflite_model_path
+from service.movenet_service import MOVENET_VARIANTS
+DATASET_DIR = os.path.join("data", "lstm_dataset")
+REPRESENTATIVE_SAMPLES = 100
+
+
+def apply_quantization(converter, quantization, representative_fn=None):
+    if quantization == "none":
+        return converter
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "int8":
+        converter.representative_dataset = representative_fn
+        # int8 커널이 없는 연산은 float로 남김
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+            tf.lite.OpsSet.TFLITE_BUILTINS,
+        ]
+    return converter
+
+
+def write_model(tflite_model, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".part"
+    with open(tmp_path, "wb") as f:
+        f.write(tflite_model)
+    os.replace(tmp_path, path)
+    print(f"  저장: {path} ({len(tflite_model) / 1024 ** 2:.2f}MB)")
+
+
+# LSTM 대표 데이터: 원본(증강 제외) diff 시퀀스를 학습 길이로 패딩
+def lstm_representative_data(pitch_type, maxlen):
+    files = sorted(f for f in glob(os.path.join(DATASET_DIR, pitch_type, "*_diff.npy"))
+                   if not any(tag in f for tag in ("_jitter", "_stretch", "_compress")))
+    files = files[:REPRESENTATIVE_SAMPLES]
+
+    def generate():
+        for f in files:
+            seq = pad_sequences([np.load(f)], padding="post", maxlen=maxlen, dtype="float32",
+                                truncating="post")
+            yield [seq]
+    return generate
+
+
+def export_lstm(pitch_type, quantization):
+    model = load_model(os.path.join("model", f"lstm_{pitch_type}.h5"), compile=False)
+    maxlen = EXPECTED_LEN[pitch_type]
+
+    # 배치 1, 학습 길이로 고정해야 LSTM이 TFLite fused 연산으로 변환됨
+    predict = tf.function(lambda x: model(x, training=False))
+    concrete = predict.get_concrete_function(tf.TensorSpec([1, maxlen, FEATURE_DIM], tf.float32))
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+    apply_quantization(converter, quantization, lstm_representative_data(pitch_type, maxlen))
+    write_model(converter.convert(), tflite_model_path(f"lstm_{pitch_type}", quantization))
+
+
+# MoveNet 대표 데이터: 영상 프레임을 서비스와 같은 방식으로 전처리
+def movenet_representative_data(video_paths, size):
+    def generate():
+        count = 0
+        for video_path in video_paths:
+            cap = cv2.VideoCapture(video_path)
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 1
+            step = max(total // (REPRESENTATIVE_SAMPLES // len(video_paths) or 1), 1)
+            index = 0
+            while count < REPRESENTATIVE_SAMPLES:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if index % step == 0:
+                    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                    image = tf.image.resize_with_pad(tf.expand_dims(rgb, axis=0), size, size)
+                    yield [tf.cast(image, tf.int32)]
+                    count += 1
+                index += 1
+            cap.release()
+    return generate
+
+
+def export_movenet(variant, quantization, video_paths):
+    name, size = MOVENET_VARIANTS[variant]["name"], MOVENET_VARIANTS[variant]["size"]
+    movenet = tf.saved_model.load(os.path.join("model", name))
+    movenet_fn = movenet.signatures["serving_default"]
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([movenet_fn], movenet)
+    apply_quantization(converter, quantization, movenet_representative_data(video_paths, size))
+    write_model(converter.convert(), tflite_model_path(name, quantization))
+
+
+# 변환마다 별도 프로세스에서 실행
+# (int8 보정 중 변환기가 segfault로 종료되는 모델이 있어도 나머지 변환은 계속 진행)
+def run_isolated(label, fn, *args):
+    print(f"{label}")
+    proc = multiprocessing.get_context("spawn").Process(target=fn, args=args)
+    proc.start()
+    proc.join()
+    if proc.exitcode != 0:
+        print(f"  변환 실패 (exit code {proc.exitcode})")
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1] if len(sys.argv) > 1 else config.TFLITE_QUANTIZATION
+    if mode not in QUANTIZATIONS + ("all",):
+        print("사용법: python train/export_tflite.py [none|dynamic|int8|all] [video_path ...]")
+        sys.exit()
+    quantizations = list(QUANTIZATIONS) if mode == "all" else [mode]
+    video_paths = sys.argv[2:]
+
+    for quantization in quantizations:
+        for pitch_type in EXPECTED_LEN:
+            if not os.path.exists(os.path.join("model", f"lstm_{pitch_type}.h5")):
+                print(f"[LSTM] 스킵 (파일 없음): lstm_{pitch_type}.h5")
+                continue
+            run_isolated(f"[LSTM] {pitch_type} → {quantization}", export_lstm, pitch_type, quantization)
+
+        for variant, spec in MOVENET_VARIANTS.items():
+            model_dir = os.path.join("model", spec["name"])
+            if not os.path.exists(os.path.join(model_dir, "saved_model.pb")):
+                print(f"[MoveNet] 스킵 (SavedModel 없음): {model_dir}")
+            elif quantization == "int8" and not video_paths:
+                print(f"[MoveNet] {spec['name']} int8 스킵 (대표 데이터용 영상 경로 필요)")
+            else:
+                run_isolated(f"[MoveNet] {spec['name']} → {quantization}", export_movenet,
+                             variant, quantization, video_paths)
@@ -1,24 +1,19 @@
 import sys, os
-from glob import glob
-from movenet_train import extract_keypoints_for_training
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.dataset_runner import build_keypoint_dataset
+from service.movenet_service import movenet_model_version
 
 # 경로 설정
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
 LEARNING_DIR = os.path.join(BASE_PATH, "..", "data", "Learning")
 OUTPUT_DIR = os.path.join(BASE_PATH, "..", "data", "keypoints_norm")
 
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# 모델(또는 추출 방식)이 바뀌면 전체 재추출되도록 manifest에 기록하는 버전 (서버 캐시 키와 같은 모델 버전)
+MODEL_VERSION = f"{movenet_model_version('thunder')}:train-ccw"
 
-# 영상 파일 목록 필터링
-video_files = glob(os.path.join(LEARNING_DIR, "*", "*"))
-video_files = [vf for vf in video_files if vf.lower().endswith(('.mov', '.mp4', '.avi', '.mkv'))]
-print(f"총 {len(video_files)}개 학습용 영상 탐색 완료")
-
-# MoveNet 기반 키포인트 추출 실행
-for video_path in video_files:
-    try:
-        extract_keypoints_for_training(video_path, OUTPUT_DIR)
-    except Exception as e:
-        print(f"오류 발생: {video_path} → {e}")
-
-print("모든 학습용 영상의 keypoints_norm 추출 완료.")
\ No newline at end of file
+# MoveNet 기반 키포인트 추출 실행 (worker마다 movenet_train 모듈 = 모델 1개)
+# 사용법: python train/generate_keypoints_dataset_train.py [worker 수]
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    build_keypoint_dataset(LEARNING_DIR, OUTPUT_DIR, "movenet_train:extract_training_keypoints", MODEL_VERSION, workers)
+    print("모든 학습용 영상의 keypoints_norm 추출 완료.")
@@ -7,34 +7,124 @@ from tensorflow.keras.callbacks import EarlyStopping
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Masking, TimeDistributed
-from tensorflow.keras.preprocessing.sequence import pad_sequences
+from packed_dataset import PackedDataset, pack_legacy_dataset, packed_path, LEGACY_DIR
 
 #명령행
 if len(sys.argv) < 2:
-    print("사용법: python train/lstm.py [pitch_type]")
+    print("사용법: python train/lstm.py [pitch_type] [seed]")
     sys.exit()
 
 pitch_type = sys.argv[1].lower()
-dataset_dir = os.path.join("data/lstm_dataset", pitch_type)
+seed = int(sys.argv[2]) if len(sys.argv) > 2 else 42
+tf.keras.utils.set_random_seed(seed)
+dataset_dir = packed_path(pitch_type)
 model_path = os.path.join("model", f"lstm_{pitch_type}.h5")
 os.makedirs("model", exist_ok=True)
 
+BATCH_SIZE = 32
+NUM_BUCKETS = 4
+# 이 크기 이하의 데이터셋은 첫 epoch에 메모리에 캐시 (그 이상은 매 epoch memmap에서 스트리밍)
+CACHE_LIMIT_BYTES = 512 * 1024 * 1024
 
-#데이터 로딩 함수
+# 학습 배치 증강 (매 배치 새 난수, seed가 같으면 epoch별 난수열도 같음)
+JITTER_STD = 0.015
+TIME_WARP_RANGE = (0.9, 1.1)
+# 증강 확률 (기존 데이터셋: 원본 1개 + 증강 사본 3개)
+AUGMENT_PROB = 0.75
+# 증강 샘플 라벨: 비정상 프레임 비율 ≥ 20% → 전체 1, 아니면 전체 0 (기존 증강 사본과 같은 규칙)
+SEQUENCE_RATIO_THRESHOLD = 0.2
+
+
+#데이터 로딩 함수 (packed 형식, 없거나 기존 .npy가 더 새로우면 먼저 변환)
 def load_lstm_dataset(folder):
-    X, y = [], []
-    for filename in os.listdir(folder):
-        if filename.endswith("_diff.npy"):
-            diff_path = os.path.join(folder, filename)
-            label_path = diff_path.replace("_diff.npy", "_label.npy")
-            try:
-                diff_seq = np.load(diff_path)
-                label_seq = np.load(label_path)
-                X.append(diff_seq)
-                y.append(label_seq)
-            except Exception as e:
-                print(f"오류: {filename} → {e}")
-    return X, y
+    meta_path = os.path.join(folder, "meta.json")
+    legacy_folder = os.path.join(LEGACY_DIR, pitch_type)
+    if os.path.isdir(legacy_folder):
+        legacy_mtime = max((os.path.getmtime(os.path.join(legacy_folder, f)) for f in os.listdir(legacy_folder)), default=0)
+        if not os.path.exists(meta_path) or legacy_mtime > os.path.getmtime(meta_path):
+            pack_legacy_dataset(pitch_type)
+
+    return PackedDataset(folder)
+
+
+# 길이 분위수로 bucket 경계 결정 → 비슷한 길이끼리 배치, 배치 안에서만 padding
+def bucket_boundaries(lengths, num_buckets=NUM_BUCKETS):
+    quantiles = np.quantile(lengths, np.linspace(0, 1, num_buckets + 1)[1:-1])
+    return sorted({int(q) + 1 for q in quantiles})
+
+
+#배치 증강: AUGMENT_PROB 확률로 샘플별 time-warp(선형 보간) + jitter, 패딩 구간은 0 유지 (Masking)
+# 증강한 샘플은 시퀀스 단위 라벨(전체 0 또는 1), 증강하지 않은 샘플은 프레임별 라벨 그대로
+def augment_batch(x, y, lengths, seed):
+    batch = tf.shape(x)[0]
+    lengths_f = tf.cast(lengths, tf.float32)
+    seeds = tf.random.experimental.stateless_split(seed, 3)
+
+    augmented = tf.random.stateless_uniform([batch], seeds[2]) < AUGMENT_PROB
+    factors = tf.random.stateless_uniform([batch], seeds[0], *TIME_WARP_RANGE)
+    factors = tf.where(augmented, factors, 1.0)
+    new_lengths = tf.maximum(tf.cast(tf.round(lengths_f * factors), tf.int32), 2)
+    positions = tf.cast(tf.range(tf.reduce_max(new_lengths)), tf.float32)[None, :]
+
+    # 출력 프레임 t → 원본 위치 t * (L - 1) / (L' - 1)
+    src = positions * ((lengths_f - 1) / tf.cast(new_lengths - 1, tf.float32))[:, None]
+    src = tf.minimum(src, (lengths_f - 1)[:, None])
+    lower = tf.cast(tf.floor(src), tf.int32)
+    upper = tf.minimum(lower + 1, lengths[:, None] - 1)
+    weight = (src - tf.cast(lower, tf.float32))[..., None]
+    x_warp = (tf.gather(x, lower, batch_dims=1) * (1 - weight)
+              + tf.gather(x, upper, batch_dims=1) * weight)
+    y_warp = tf.gather(y, tf.cast(tf.round(src), tf.int32), batch_dims=1)
+
+    valid = tf.sequence_mask(new_lengths, tf.shape(positions)[1], dtype=tf.float32)[..., None]
+    noise = tf.random.stateless_normal(tf.shape(x_warp), seeds[1], stddev=JITTER_STD)
+    noise *= tf.cast(augmented, tf.float32)[:, None, None]
+
+    abnormal_ratio = tf.reduce_sum(y[..., 0], axis=1) / lengths_f
+    sequence_label = tf.cast(abnormal_ratio >= SEQUENCE_RATIO_THRESHOLD, tf.float32)[:, None, None]
+    y_out = tf.where(augmented[:, None, None], tf.ones_like(y_warp) * sequence_label, y_warp)
+    return (x_warp + noise) * valid, y_out * valid
+
+
+#packed 데이터셋의 시퀀스 indices → tf.data (시퀀스를 하나씩 memmap에서 읽음)
+def make_tf_dataset(dataset, indices, boundaries, shuffle, augment=False):
+    feature_dim = dataset.meta["feature_dim"]
+    cache = dataset.diff.nbytes <= CACHE_LIMIT_BYTES
+    # 캐시하지 않는 경우 shuffle buffer 대신 generator가 epoch마다 순서를 섞음 (메모리에 모으지 않음)
+    rng = np.random.default_rng(seed)
+
+    def generate():
+        order = rng.permutation(indices) if shuffle and not cache else indices
+        for i in order:
+            diff_seq, label_seq = dataset[i]
+            yield np.asarray(diff_seq), np.asarray(label_seq, dtype=np.float32)[:, None], len(diff_seq)
+
+    ds = tf.data.Dataset.from_generator(generate, output_signature=(
+        tf.TensorSpec((None, feature_dim), tf.float32),
+        tf.TensorSpec((None, 1), tf.float32),
+        tf.TensorSpec((), tf.int32),
+    ))
+    if cache:
+        # 전체가 메모리에 캐시되므로 전체 크기 shuffle buffer도 추가 메모리가 들지 않음
+        ds = ds.cache()
+        if shuffle:
+            ds = ds.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+    ds = ds.bucket_by_sequence_length(
+        element_length_func=lambda x, y, length: length,
+        bucket_boundaries=boundaries,
+        bucket_batch_sizes=[BATCH_SIZE] * (len(boundaries) + 1),
+        padded_shapes=([None, feature_dim], [None, 1], []),
+    )
+    if augment:
+        # 배치마다 seed 한 쌍 (epoch마다 새 난수열, 시작 seed로 재현 가능)
+        batch_seeds = tf.data.Dataset.random(seed=seed, rerandomize_each_iteration=True).batch(2)
+        ds = tf.data.Dataset.zip((ds, batch_seeds)).map(
+            lambda batch, batch_seed: augment_batch(*batch, batch_seed),
+            num_parallel_calls=tf.data.AUTOTUNE,
+        )
+    else:
+        ds = ds.map(lambda x, y, length: (x, y))
+    return ds.prefetch(tf.data.AUTOTUNE)
 
 
 #모델 생성
@@ -50,24 +140,27 @@ def build_model(input_shape):
     return model
 
 
-#데이터 로드 및 전처리
-X, y = load_lstm_dataset(dataset_dir)
-if len(X) < 3:
-    print(f"데이터가 너무 적습니다: {len(X)}개")
+#데이터 로드 및 tf.data 구성
+dataset = load_lstm_dataset(dataset_dir)
+# 원본 시퀀스만 사용 (이전 형식의 증강 사본은 제외, 증강은 학습 중에 적용)
+originals = dataset.indices(augmentation=None)
+if len(originals) < 3:
+    print(f"데이터가 너무 적습니다: {len(originals)}개")
     sys.exit()
 
-print(f"{pitch_type} 데이터 개수: {len(X)}")
-X = pad_sequences(X, padding='post', dtype='float32')
-y = pad_sequences(y, padding='post', dtype='float32')
+lengths = dataset.lengths
+print(f"{pitch_type} 데이터 개수: {len(originals)} (seed {seed})")
+print(f"시퀀스 길이: min {lengths[originals].min()}, max {lengths[originals].max()}, 평균 {lengths[originals].mean():.1f}")
 
-print("X shape:", X.shape)
-print("y shape:", y.shape)
-print("y unique:", np.unique(y))
+train_idx, test_idx = train_test_split(originals, test_size=0.2, random_state=seed)
+boundaries = bucket_boundaries(lengths[train_idx])
+print("bucket 경계:", boundaries)
+train_ds = make_tf_dataset(dataset, train_idx, boundaries, shuffle=True, augment=True)
+test_ds = make_tf_dataset(dataset, test_idx, boundaries, shuffle=False)
 
 
-# 모델 학습
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2)
-model = build_model(input_shape=X_train.shape[1:])
+# 모델 학습 (시간 축 None: 배치마다 길이가 다름)
+model = build_model(input_shape=(None, dataset.meta["feature_dim"]))
 model.summary()
 
 early_stop = EarlyStopping(
@@ -78,9 +171,9 @@ early_stop = EarlyStopping(
 )
 
 history = model.fit(
-    X_train, y_train,
+    train_ds,
     epochs=50,
-    validation_data=(X_test, y_test),
+    validation_data=test_ds,
     callbacks=[early_stop],
     verbose=1
 )
@@ -1,97 +1,142 @@
 import os
 import sys
+import time
+import multiprocessing
 import numpy as np
 
 # 상위 디렉터리 추가
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))) 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
 from service.dtw_service import compare_poses, compute_diff_sequence
-from scipy.interpolate import interp1d
+from service.dataset_runner import Manifest, file_sha256, save_npy_atomic
+from packed_dataset import AUGMENTATIONS, pack_legacy_dataset, packed_path
 
 #경로 설정
 BASE_PATH = os.path.dirname(os.path.abspath(__file__))
 KEYPOINT_DIR = os.path.join(BASE_PATH, "..", "data", "keypoints_norm")
 OUTPUT_DIR = os.path.join(BASE_PATH, "..", "data", "lstm_dataset")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # 구질 목록
 PITCH_TYPES = ["twohand", "stroker", "cranker", "thumbless"]
 
 # 프레임별 라벨 기준
 FRAME_THRESHOLD = 0.1   # 프레임별 diff 임계값
-SEQUENCE_RATIO_THRESHOLD = 0.2  # 비정상 프레임 비율 ≥ 20% → 비정상 시퀀스로 간주
 
 
-#데이터 증강 함수
-def jitter_sequence(seq, std=0.015):
-    noise = np.random.normal(0, std, seq.shape)
-    return seq + noise
+# 데이터 증강(jitter, time-warp)은 학습 input pipeline에서 매 epoch 새로 적용 (lstm_train.py)
+# 이전 버전이 저장한 증강 사본 이름: {이름}_jitter / _stretch / _compress
+def remove_outputs(output_dir, names):
+    for name in names:
+        for kind in ("diff", "label"):
+            output_path = os.path.join(output_dir, f"{name}_{kind}.npy")
+            if os.path.exists(output_path):
+                os.remove(output_path)
 
-def time_warp_sequence(seq, factor):
-    from scipy.interpolate import interp1d
-    t = np.linspace(0, 1, len(seq))
-    t_new = np.linspace(0, 1, int(len(seq) * factor))
-    interpolator = interp1d(t, seq, axis=0, kind='linear', fill_value='extrapolate')
-    return interpolator(t_new)
 
-def save_augmented(diff_seq, is_wrong, base_name, suffix, output_dir):
-    label_seq = np.ones((diff_seq.shape[0], 1)) if is_wrong else np.zeros((diff_seq.shape[0], 1))
-    np.save(os.path.join(output_dir, f"{base_name}_{suffix}_diff.npy"), diff_seq)
-    np.save(os.path.join(output_dir, f"{base_name}_{suffix}_label.npy"), label_seq)
-    print(f"증강 저장: {base_name}_{suffix} (shape: {diff_seq.shape})")
+def augmented_names(base_name):
+    return [f"{base_name}_{augmentation}" for augmentation in AUGMENTATIONS]
 
 
-# 구질별 데이터셋 생성 루프
-for pitch in PITCH_TYPES:
-    ref_path = os.path.join(KEYPOINT_DIR, pitch, f"{pitch}_001.npy")
-    if not os.path.exists(ref_path):
-        print(f"기준 파일 없음: {ref_path} (스킵)")
-        continue
+# 기준 파일 내용 + 라벨/DTW 설정이 바뀌면 해당 구질 전체를 다시 생성
+def build_version(ref_path):
+    return (f"ref:{file_sha256(ref_path)[:16]}|window:{config.DTW_WINDOW}|"
+            f"frame:{FRAME_THRESHOLD}|aug:online")
 
-    pitch_output_dir = os.path.join(OUTPUT_DIR, pitch)
-    os.makedirs(pitch_output_dir, exist_ok=True)
 
-    pitch_dir = os.path.join(KEYPOINT_DIR, pitch)
-    files = [f for f in os.listdir(pitch_dir) if f.endswith(".npy")]
-
-    print(f"[{pitch}] 총 {len(files)}개 파일 처리 시작")
+#파일 1개 처리 (worker 프로세스) — 기준 자세는 worker별 reference_store에 한 번만 로드됨
+def build_one(task):
+    ref_path, file_path, output_dir = task
+    start = time.perf_counter()
+    try:
+        distance, ref, test, path = compare_poses(ref_path, file_path)
+        diff_seq = compute_diff_sequence(ref, test, path)  # shape: (T, 34)
 
-    for filename in files:
-        file_path = os.path.join(pitch_dir, filename)
-        if file_path == ref_path:
-            continue
+        # 프레임 단위 라벨링
+        frame_diffs = np.mean(np.abs(diff_seq), axis=1)  # 각 프레임별 평균 diff
+        label_seq = (frame_diffs >= FRAME_THRESHOLD).astype(int).reshape(-1, 1)
 
-        try:
-            print(f"처리 중: {filename}")
-            distance, ref, test, path = compare_poses(ref_path, file_path)
-            diff_seq = compute_diff_sequence(ref, test, path)  # shape: (T, 34)
+        # 비정상 프레임 비율 (로그용)
+        abnormal_ratio = np.mean(label_seq)
 
+        base_name = os.path.basename(file_path).replace(".npy", "")
+        save_npy_atomic(os.path.join(output_dir, f"{base_name}_label.npy"), label_seq)
+        # diff를 마지막에 저장 (manifest 확인 기준 파일)
+        save_npy_atomic(os.path.join(output_dir, f"{base_name}_diff.npy"), diff_seq)
+        remove_outputs(output_dir, augmented_names(base_name))
+        return file_path, diff_seq.shape, abnormal_ratio, None, time.perf_counter() - start
+    except Exception as e:
+        return file_path, None, None, str(e), time.perf_counter() - start
 
-            # 프레임 단위 라벨링
-            frame_diffs = np.mean(np.abs(diff_seq), axis=1)  # 각 프레임별 평균 diff
-            label_seq = (frame_diffs >= FRAME_THRESHOLD).astype(int).reshape(-1, 1)
 
+#입력이 삭제된 출력 파일 정리
+def remove_stale(manifest, pitch_output_dir, sources):
+    removed = 0
+    for key, entry in list(manifest.entries.items()):
+        if entry["source"] in sources:
+            continue
+        base_name = key[:-len("_diff.npy")]
+        remove_outputs(pitch_output_dir, [base_name] + augmented_names(base_name))
+        del manifest.entries[key]
+        removed += 1
+    return removed
 
-            # 시퀀스 전체 중 20% 이상이 비정상이면 “비정상 시퀀스”
-            abnormal_ratio = np.mean(label_seq)
-            is_wrong = abnormal_ratio >= SEQUENCE_RATIO_THRESHOLD
 
-            base_name = filename.replace(".npy", "")
+#구질 1개: 바뀐 입력만 process pool로 DTW → diff/label 저장 → packed 형식 갱신
+def build_pitch(pitch, pool):
+    ref_path = os.path.join(KEYPOINT_DIR, pitch, f"{pitch}_001.npy")
+    if not os.path.exists(ref_path):
+        print(f"기준 파일 없음: {ref_path} (스킵)")
+        return
 
+    pitch_output_dir = os.path.join(OUTPUT_DIR, pitch)
+    os.makedirs(pitch_output_dir, exist_ok=True)
+    manifest = Manifest(pitch_output_dir)
+    version = build_version(ref_path)
 
-            # 저장
-            np.save(os.path.join(pitch_output_dir, f"{base_name}_diff.npy"), diff_seq)
-            np.save(os.path.join(pitch_output_dir, f"{base_name}_label.npy"), label_seq)
+    pitch_dir = os.path.join(KEYPOINT_DIR, pitch)
+    files = sorted(os.path.join(pitch_dir, f) for f in os.listdir(pitch_dir) if f.endswith(".npy"))
+    files = [f for f in files if os.path.normpath(f) != os.path.normpath(ref_path)]
+
+    tasks = {}
+    refreshed = False
+    for file_path in files:
+        key = os.path.basename(file_path).replace(".npy", "_diff.npy")
+        sha256 = manifest.source_hash(file_path)
+        if manifest.is_current(key, sha256, version, os.path.join(pitch_output_dir, key)):
+            refreshed = manifest.refresh_stat(key, file_path) or refreshed
+            continue
+        tasks[file_path] = (key, sha256)
+    removed = remove_stale(manifest, pitch_output_dir, {os.path.abspath(f) for f in files})
+    if refreshed or removed:
+        manifest.save()
+
+    print(f"[{pitch}] 총 {len(files)}개 파일 | 최신 {len(files) - len(tasks)}개 건너뜀 | "
+          f"생성 {len(tasks)}개 | 삭제 {removed}개")
+    if not tasks and not removed and os.path.exists(os.path.join(packed_path(pitch), "meta.json")):
+        return
+
+    start = time.perf_counter()
+    jobs = [(ref_path, file_path, pitch_output_dir) for file_path in tasks]
+    for file_path, shape, abnormal_ratio, error, elapsed in pool.imap_unordered(build_one, jobs):
+        filename = os.path.basename(file_path)
+        if error is not None:
+            print(f"실패: {filename} → {error}")
+            continue
+        key, sha256 = tasks[file_path]
+        manifest.record(key, file_path, sha256, version, shape)
+        manifest.save()
+        print(f"저장 완료: {pitch}/{filename} | 비정상 비율={abnormal_ratio:.2f} | 전체={shape[0]}프레임 ({elapsed:.2f}s)")
+    if tasks:
+        print(f"[{pitch}] DTW {len(tasks)}개 완료 ({time.perf_counter() - start:.1f}s)")
 
-            # ---------------------
-            # 데이터 증강 (라벨 유지)
-            # ---------------------
-            save_augmented(jitter_sequence(diff_seq), is_wrong, base_name, "jitter", pitch_output_dir)
-            save_augmented(time_warp_sequence(diff_seq, 1.1), is_wrong, base_name, "stretch", pitch_output_dir)
-            save_augmented(time_warp_sequence(diff_seq, 0.9), is_wrong, base_name, "compress", pitch_output_dir)
+    pack_legacy_dataset(pitch)
 
-            print(f"저장 완료: {pitch}/{base_name} | 비정상 비율={abnormal_ratio:.2f} | 전체={len(label_seq)}프레임")
 
-        except Exception as e:
-            print(f"실패: {filename} → {e}")
+if __name__ == "__main__":
+    pitch_types = [p.lower() for p in sys.argv[1:]] or PITCH_TYPES
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(config.DATASET_WORKERS) as pool:
+        for pitch in pitch_types:
+            build_pitch(pitch, pool)
 
-print("모든 구질의 LSTM 학습용 diff/label 데이터셋 생성 완료.")
\ No newline at end of file
+    print("모든 구질의 LSTM 학습용 diff/label 데이터셋 생성 완료.")
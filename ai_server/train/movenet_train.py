@@ -1,12 +1,13 @@
 import os
+import sys
 import glob
 import numpy as np
 import tensorflow as tf
-import tensorflow_hub as hub
 import cv2
 
-
-movenet = hub.load("https://tfhub.dev/google/movenet/singlepose/thunder/4").signatures['serving_default']
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service.pose_pipeline import run_pose_pipeline
+from service.dataset_runner import save_npy_atomic
 
 
 # GPU 메모리 제어
@@ -76,68 +77,68 @@ def rotate_keypoints_90ccw(keypoints):
 
 
 # 학습용 keypoints 추출 함수
-def extract_keypoints_for_training(video_path, output_folder):
+def extract_training_keypoints(video_path, batch_size=32):
     """
-    학습용 영상에서 keypoints_norm만 추출하여 .npy로 저장
+    학습용 영상에서 keypoints_norm (N, 17, 3)을 추출하여 반환 (실패 시 None)
     """
     video_name = os.path.splitext(os.path.basename(video_path))[0]
-    label = video_name.split("_")[0]
-    class_folder = os.path.join(output_folder, label)
-    os.makedirs(class_folder, exist_ok=True)
-    output_path = os.path.join(class_folder, f"{video_name}.npy")
-
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        print(f"영상 열기 실패: {video_path}")
-        return None
-
-    all_keypoints = []
-    frame_count = 0
-    orientation_checked = False
-    rotation_needed = False
+    rotation = {"checked": False, "needed": False}
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        frame_count += 1
-        if frame_count % 10 == 0:
-            print(f"{video_name} 프레임 {frame_count} 처리 중...")
-
-        # 회전 방향 감지 (처음 1회만)
-        if not orientation_checked:
+    # decode 단계: 회전 방향 감지(처음 1회만) + 회전 + RGB 변환
+    def prepare_frame(frame):
+        if not rotation["checked"]:
             orientation = detect_video_orientation(frame)
             if orientation == "portrait":
                 print(f"[INFO] 세로 영상 감지됨 → 90° 반시계 회전 적용: {video_name}")
-                rotation_needed = True
-            orientation_checked = True
+                rotation["needed"] = True
+            rotation["checked"] = True
 
         # 세로 영상일 경우 프레임 회전
-        if rotation_needed:
+        if rotation["needed"]:
             frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+    # infer 단계: 실패한 프레임은 제외
+    def infer_batch(frames):
+        keypoints = []
+        for frame in frames:
+            try:
+                keypoints.append(detect_pose(tf.convert_to_tensor(frame)))
+            except Exception as e:
+                print(f"키포인트 추출 오류 ({video_name}): {e}")
+        return np.array(keypoints).reshape(-1, 17, 3)
+
+    # post 단계: 정규화 (세로 영상이면 keypoints도 좌표계 반시계 회전)
+    def postprocess(keypoints):
+        normalized = [normalize_keypoints(kp) for kp in keypoints]
+        if rotation["needed"]:
+            normalized = [rotate_keypoints_90ccw(kp) for kp in normalized]
+        return np.array(normalized)
+
+    _, all_keypoints = run_pose_pipeline(
+        video_path,
+        infer_fn=infer_batch,
+        post_fn=postprocess,
+        frame_fn=prepare_frame,
+        batch_size=batch_size,
+        name=video_name
+    )
+
+    if all_keypoints is None or len(all_keypoints) == 0:
+        print(f"{video_name} 처리 실패: 키포인트 없음")
+        return None
+    return all_keypoints
 
-        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        image_tensor = tf.convert_to_tensor(image_rgb)
-
-        try:
-            keypoints = detect_pose(image_tensor)
-            normalized = normalize_keypoints(keypoints)
-            # 세로 영상이면 keypoints도 좌표계 반시계 회전
-            if rotation_needed:
-                normalized = np.array(rotate_keypoints_90ccw(normalized))
-            all_keypoints.append(normalized)
-        except Exception as e:
-            print(f"키포인트 추출 오류 (프레임 {frame_count}): {e}")
-
-    cap.release()
 
-    if len(all_keypoints) == 0:
-        print(f"{video_name} 처리 실패: 키포인트 없음")
+# 학습용 영상에서 keypoints_norm만 추출하여 output_folder/{구질}/{이름}.npy로 저장
+def extract_keypoints_for_training(video_path, output_folder, batch_size=32):
+    all_keypoints = extract_training_keypoints(video_path, batch_size)
+    if all_keypoints is None:
         return None
 
-    all_keypoints = np.array(all_keypoints)
-    np.save(output_path, all_keypoints)
+    video_name = os.path.splitext(os.path.basename(video_path))[0]
+    output_path = os.path.join(output_folder, video_name.split("_")[0], f"{video_name}.npy")
+    save_npy_atomic(output_path, all_keypoints)
     print(f"저장 완료: {output_path} (shape: {all_keypoints.shape})")
 
-    return output_path
\ No newline at end of file
+    return output_path
@@ -0,0 +1,183 @@
+# packed_dataset.py
+# 구질별 LSTM 학습 데이터를 파일 몇 개로 묶은 packed 형식 (np.memmap으로 복사 없이 읽기)
+#
+# data/lstm_packed/{구질}/
+#   diff.f32     : 모든 시퀀스를 이어 붙인 diff (전체 프레임, 34) float32
+#   labels.u8    : 프레임별 라벨 (전체 프레임,) uint8
+#   offsets.i64  : 시퀀스 i = [offsets[i], offsets[i+1]) (시퀀스 수 + 1,) int64
+#   meta.json    : 개수/shape + 시퀀스별 이름, 원본 클립, 증강 종류 (마지막에 기록 → 완료 표시)
+#
+# 기존 형식(data/lstm_dataset/{구질}/*_diff.npy + *_label.npy) 변환:
+#   python train/packed_dataset.py [pitch_type ...]
+import os
+import sys
+import json
+from glob import glob
+import numpy as np
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+LEGACY_DIR = os.path.join(BASE_PATH, "..", "data", "lstm_dataset")
+PACKED_DIR = os.path.join(BASE_PATH, "..", "data", "lstm_packed")
+FORMAT_VERSION = 1
+FEATURE_DIM = 34
+AUGMENTATIONS = ("jitter", "stretch", "compress")
+
+FILES = {"diff": "diff.f32", "labels": "labels.u8", "offsets": "offsets.i64"}
+
+
+class PackedWriter:
+    """
+    시퀀스를 하나씩 add()하면 바로 파일 끝에 이어 씁니다 (전체를 메모리에 모으지 않음).
+    close() 시 .part 파일을 교체하고 meta.json을 마지막에 기록합니다.
+    """
+
+    def __init__(self, root, pitch_type, feature_dim=FEATURE_DIM):
+        self.root = root
+        self.pitch_type = pitch_type
+        self.feature_dim = feature_dim
+        os.makedirs(root, exist_ok=True)
+        self._diff = open(self._part("diff"), "wb")
+        self._labels = open(self._part("labels"), "wb")
+        self.offsets = [0]
+        self.sequences = []
+
+    def _part(self, kind):
+        return os.path.join(self.root, FILES[kind] + ".part")
+
+    def add(self, diff_seq, label_seq, name, source=None, augmentation=None):
+        diff_seq = np.ascontiguousarray(diff_seq, dtype=np.float32).reshape(-1, self.feature_dim)
+        label_seq = np.asarray(label_seq).reshape(-1).astype(np.uint8)
+        if len(diff_seq) != len(label_seq):
+            raise ValueError(f"diff/label 길이 불일치: {name} ({len(diff_seq)} vs {len(label_seq)})")
+        self._diff.write(diff_seq.tobytes())
+        self._labels.write(label_seq.tobytes())
+        self.offsets.append(self.offsets[-1] + len(diff_seq))
+        self.sequences.append({"name": name, "source": source or name, "augmentation": augmentation})
+
+    def close(self):
+        self._diff.close()
+        self._labels.close()
+        np.asarray(self.offsets, dtype=np.int64).tofile(self._part("offsets"))
+        # 이전 meta.json을 먼저 지워야 바이너리 교체 도중에는 "미완료"로 보임 (meta.json = 완료 표시)
+        meta_path = os.path.join(self.root, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        for kind in FILES:
+            os.replace(self._part(kind), os.path.join(self.root, FILES[kind]))
+
+        meta = {
+            "version": FORMAT_VERSION,
+            "pitch_type": self.pitch_type,
+            "feature_dim": self.feature_dim,
+            "count": len(self.sequences),
+            "frames": self.offsets[-1],
+            "files": FILES,
+            "sequences": self.sequences,
+        }
+        tmp_path = os.path.join(self.root, "meta.json.part")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, meta_path)
+
+    def abort(self):
+        self._diff.close()
+        self._labels.close()
+        for kind in FILES:
+            if os.path.exists(self._part(kind)):
+                os.remove(self._part(kind))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _memmap(path, dtype, shape):
+    # 길이 0 파일은 mmap할 수 없음
+    if shape[0] == 0:
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+class PackedDataset:
+    """
+    packed 데이터셋 읽기. 파일은 세 개만 열고, 시퀀스 i는 memmap slice(복사 없음)로 반환합니다.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        files, frames, dim = self.meta["files"], self.meta["frames"], self.meta["feature_dim"]
+        self.offsets = _memmap(os.path.join(root, files["offsets"]), np.int64, (self.meta["count"] + 1,))
+        self.diff = _memmap(os.path.join(root, files["diff"]), np.float32, (frames, dim))
+        self.labels = _memmap(os.path.join(root, files["labels"]), np.uint8, (frames,))
+        if self.meta["count"] and int(self.offsets[-1]) != frames:
+            raise ValueError(f"packed 데이터셋 손상: {root}")
+
+    @property
+    def sequences(self):
+        return self.meta["sequences"]
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def __len__(self):
+        return self.meta["count"]
+
+    def __getitem__(self, i):
+        """(diff (T, 34), labels (T,)) — memmap view"""
+        start, end = int(self.offsets[i]), int(self.offsets[i + 1])
+        return self.diff[start:end], self.labels[start:end]
+
+    # 원본 시퀀스만 / 특정 증강만 고르기 (augmentation=None → 원본)
+    def indices(self, augmentation="all"):
+        if augmentation == "all":
+            return np.arange(len(self))
+        return np.array([i for i, s in enumerate(self.sequences) if s["augmentation"] == augmentation], dtype=int)
+
+
+def packed_path(pitch_type, packed_dir=PACKED_DIR):
+    return os.path.join(packed_dir, pitch_type)
+
+
+def _parse_legacy_name(base_name):
+    """'stroker_003_jitter' → ('stroker_003', 'jitter'), 'stroker_003' → ('stroker_003', None)"""
+    for augmentation in AUGMENTATIONS:
+        if base_name.endswith(f"_{augmentation}"):
+            return base_name[:-len(augmentation) - 1], augmentation
+    return base_name, None
+
+
+def pack_legacy_dataset(pitch_type, legacy_dir=LEGACY_DIR, packed_dir=PACKED_DIR):
+    """data/lstm_dataset/{구질}/*_diff.npy + *_label.npy → data/lstm_packed/{구질}/"""
+    diff_files = sorted(glob(os.path.join(legacy_dir, pitch_type, "*_diff.npy")))
+    root = packed_path(pitch_type, packed_dir)
+    skipped = 0
+    with PackedWriter(root, pitch_type) as writer:
+        for diff_path in diff_files:
+            label_path = diff_path.replace("_diff.npy", "_label.npy")
+            base_name = os.path.basename(diff_path)[:-len("_diff.npy")]
+            try:
+                diff_seq, label_seq = np.load(diff_path), np.load(label_path)
+                source, augmentation = _parse_legacy_name(base_name)
+                writer.add(diff_seq, label_seq, base_name, source, augmentation)
+            except Exception as e:
+                skipped += 1
+                print(f"오류: {base_name} → {e}")
+    print(f"[PACK] {pitch_type}: {len(writer.sequences)}개 시퀀스, {writer.offsets[-1]}프레임 → {root}"
+          + (f" (실패 {skipped}개)" if skipped else ""))
+    return root
+
+
+if __name__ == "__main__":
+    pitch_types = [p.lower() for p in sys.argv[1:]] or sorted(
+        d for d in os.listdir(LEGACY_DIR) if os.path.isdir(os.path.join(LEGACY_DIR, d))
+    )
+    for pitch_type in pitch_types:
+        pack_legacy_dataset(pitch_type)